@@ -3,7 +3,7 @@ import re
 import shutil
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from PyPDF2 import PdfReader
+from extraction_cache import ExtractionCache, cached_extract
 from docx import Document
 
 def extract_name(text):
@@ -86,34 +86,47 @@ def create_note_doc(first_name, benchmarks, folder_path):
     doc.add_paragraph(f"{first_name} will continue current plan and using context clues to determine meaning.")
     doc.save(os.path.join(folder_path, "note.docx"))
 
+# Bump when the parsing below changes so cached results get re-parsed
+PARSER_VERSION = "single-goal-1"
+
+def parse_iep_text(full_text):
+    name = extract_name(full_text)
+    goal, benchmarks = extract_communication_goal(full_text, name)
+    return {
+        "name": name,
+        "id": extract_id(full_text),
+        "goal": goal,
+        "benchmarks": benchmarks,
+    }
+
 def process_pdfs(folder):
-    for file_name in os.listdir(folder):
-        if not file_name.lower().endswith(".pdf"):
-            continue
+    with ExtractionCache(folder) as cache:
+        for file_name in os.listdir(folder):
+            if not file_name.lower().endswith(".pdf"):
+                continue
 
-        pdf_path = os.path.join(folder, file_name)
-        reader = PdfReader(pdf_path)
-        full_text = "\n".join(page.extract_text() or "" for page in reader.pages)
+            pdf_path = os.path.join(folder, file_name)
+            parsed = cached_extract(cache, pdf_path, PARSER_VERSION, parse_iep_text)
 
-        name = extract_name(full_text)
-        student_id = extract_id(full_text)
-        goal, benchmarks = extract_communication_goal(full_text, name)
+            name = parsed["name"]
+            student_id = parsed["id"]
+            goal, benchmarks = parsed["goal"], parsed["benchmarks"]
 
 
-        # Backup name if it's missing
-        if not name:
-            name_guess = re.search(r"([A-Z][a-z]+) will", goal)
-            name = f"Unknown {name_guess.group(1)}" if name_guess else "Unknown"
+            # Backup name if it's missing
+            if not name:
+                name_guess = re.search(r"([A-Z][a-z]+) will", goal)
+                name = f"Unknown {name_guess.group(1)}" if name_guess else "Unknown"
 
-        safe_name = re.sub(r'[\\/*?:"<>|\n]', '', name.replace(",", "").replace(" ", "_"))
-        folder_name = f"{safe_name}_{student_id or 'NoID'}"
-        student_folder = os.path.join(folder, folder_name)
-        os.makedirs(student_folder, exist_ok=True)
+            safe_name = re.sub(r'[\\/*?:"<>|\n]', '', name.replace(",", "").replace(" ", "_"))
+            folder_name = f"{safe_name}_{student_id or 'NoID'}"
+            student_folder = os.path.join(folder, folder_name)
+            os.makedirs(student_folder, exist_ok=True)
 
-        first_name = extract_first_name(name)
-        create_goal_doc(goal, benchmarks, student_folder)
-        create_note_doc(first_name, benchmarks, student_folder)
-        shutil.move(pdf_path, os.path.join(student_folder, file_name))
+            first_name = extract_first_name(name)
+            create_goal_doc(goal, benchmarks, student_folder)
+            create_note_doc(first_name, benchmarks, student_folder)
+            shutil.move(pdf_path, os.path.join(student_folder, file_name))
 
 def select_folder():
     folder = filedialog.askdirectory()
@@ -127,17 +140,18 @@ def run_extraction():
     else:
         messagebox.showerror("Error", "Please select a folder first.")
 
-# GUI
-root = tk.Tk()
-root.title("IEP Goal Extractor")
-root.geometry("600x400")
+if __name__ == "__main__":
+    # GUI
+    root = tk.Tk()
+    root.title("IEP Goal Extractor")
+    root.geometry("600x400")
 
-folder_path_var = tk.StringVar()
+    folder_path_var = tk.StringVar()
 
-tk.Label(root, text="Step 1: Select Folder with IEP PDFs").pack(pady=5)
-tk.Button(root, text="Select Folder", command=select_folder).pack(pady=5)
-tk.Label(root, textvariable=folder_path_var).pack(pady=5)
-tk.Label(root, text="Step 2: Run Extraction").pack(pady=5)
-tk.Button(root, text="Run Extraction", command=run_extraction).pack(pady=5)
+    tk.Label(root, text="Step 1: Select Folder with IEP PDFs").pack(pady=5)
+    tk.Button(root, text="Select Folder", command=select_folder).pack(pady=5)
+    tk.Label(root, textvariable=folder_path_var).pack(pady=5)
+    tk.Label(root, text="Step 2: Run Extraction").pack(pady=5)
+    tk.Button(root, text="Run Extraction", command=run_extraction).pack(pady=5)
 
-root.mainloop()
+    root.mainloop()
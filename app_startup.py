@@ -0,0 +1,37 @@
+import time
+import threading
+import importlib
+
+# ------------------------
+# COLD START
+# ------------------------
+# The Day One window is drawn before PyPDF2, openpyxl and python-docx are
+# imported; the pipeline imports them where they're first used. Once the
+# window is up, warm_up() imports them on a background thread while the
+# therapist is still picking a folder, so the first run doesn't pay for them
+# either. Both times are kept here and go into the run report.
+
+HEAVY_MODULES = ["PyPDF2", "openpyxl", "goals_workbook", "docx", "docx_templates"]
+
+startup = {'window_seconds': None, 'warmup_seconds': None}
+
+
+def mark_window_shown(started):
+    # started is time.perf_counter() at the top of the script
+    startup['window_seconds'] = time.perf_counter() - started
+
+
+def warm_up(modules=HEAVY_MODULES):
+    def load():
+        began = time.perf_counter()
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                # The run will report it properly if it's really missing
+                pass
+        startup['warmup_seconds'] = time.perf_counter() - began
+
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,185 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_iep import generate_caseload
+from extraction_cache import join_pages, read_iep_pages
+from day_one import (
+    build_name_lookup,
+    create_goal_doc,
+    create_note_doc,
+    extract_communication_goals,
+    load_doc_templates,
+    parse_student_text,
+    student_folder_name,
+    write_goals_excel,
+)
+
+# ------------------------
+# DAY ONE THROUGHPUT BENCHMARK
+# ------------------------
+# Generates a synthetic caseload at each size and times every Day One stage on
+# its own, so a change to one stage shows up in that stage's number only.
+# Nothing is cached between stages or runs; the caseload is rebuilt per size.
+#
+#   python benchmarks/bench_day_one.py                      94, 1,000 and 10,000 students
+#   python benchmarks/bench_day_one.py --sizes 94 --workers 4 --json results.json
+
+STAGES = ["extract", "goals", "excel", "docx", "move"]
+
+
+def timed(results, stage, count, func, *args):
+    started = time.perf_counter()
+    value = func(*args)
+    seconds = time.perf_counter() - started
+    results[stage] = {
+        'seconds': round(seconds, 3),
+        'files_per_sec': round(count / seconds, 1) if seconds else None,
+    }
+    return value
+
+
+def extract_all(paths, workers):
+    # Same reader the pipeline uses, so the number reflects the early stop
+    if workers == 1:
+        return [read_iep_pages(path) for path in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(read_iep_pages, paths, chunksize=8))
+
+
+def parse_all(texts):
+    return [extract_communication_goals(text) for text in texts]
+
+
+def write_docs(folder, records, name_lookup):
+    templates = load_doc_templates(folder)
+    for student in records:
+        first_name, folder_name = student_folder_name(student, name_lookup)
+        student_folder = os.path.join(folder, folder_name)
+        os.makedirs(student_folder, exist_ok=True)
+        create_goal_doc(student['goals'], student_folder, templates)
+        create_note_doc(first_name, student['goals'], student_folder, templates)
+
+
+def move_pdfs(folder, records, name_lookup):
+    for student in records:
+        folder_name = student_folder_name(student, name_lookup)[1]
+        filename = student['filename']
+        shutil.move(os.path.join(folder, filename), os.path.join(folder, folder_name, filename))
+
+
+def run_size(size, args, workdir):
+    folder = os.path.join(workdir, f"caseload_{size}")
+    shutil.rmtree(folder, ignore_errors=True)
+
+    started = time.perf_counter()
+    generate_caseload(folder, size, args.seed, args.pages)
+    generate_seconds = time.perf_counter() - started
+
+    filenames = sorted(f for f in os.listdir(folder) if f.lower().endswith(".pdf"))
+    paths = [os.path.join(folder, f) for f in filenames]
+    results = {}
+
+    pages = timed(results, "extract", size, extract_all, paths, args.workers)
+    texts = [join_pages(p) for p in pages]
+    timed(results, "goals", size, parse_all, texts)
+
+    # Records for the output stages, built outside the timings above
+    records = []
+    for filename, page_list, text in zip(filenames, pages, texts):
+        record = parse_student_text(text)
+        record['filename'] = filename
+        record['pages_used'] = sum(page is not None for page in page_list)
+        records.append(record)
+    name_lookup = build_name_lookup(records)
+
+    timed(results, "excel", size, write_goals_excel, records, os.path.join(folder, "iep_goals_summary.xlsx"))
+    timed(results, "docx", size, write_docs, folder, records, name_lookup)
+    timed(results, "move", size, move_pdfs, folder, records, name_lookup)
+
+    total_pages = sum(len(p) for p in pages)
+    read_pages = sum(r['pages_used'] for r in records)
+    if not args.keep:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return {
+        'size': size,
+        'generate_seconds': round(generate_seconds, 3),
+        'pages_total': total_pages,
+        'pages_read': read_pages,
+        'goals': sum(len(r['goals']) for r in records),
+        'stages': results,
+        'total_seconds': round(sum(r['seconds'] for r in results.values()), 3),
+    }
+
+
+def print_result(result):
+    print(f"\n{result['size']} students  "
+          f"({result['pages_read']}/{result['pages_total']} pages read, {result['goals']} goals, "
+          f"generated in {result['generate_seconds']:.1f}s)")
+    print(f"  {'stage':<8} {'seconds':>10} {'files/sec':>12}")
+    for stage in STAGES:
+        row = result['stages'][stage]
+        rate = row['files_per_sec'] if row['files_per_sec'] is not None else float("inf")
+        print(f"  {stage:<8} {row['seconds']:>10.3f} {rate:>12.1f}")
+    print(f"  {'total':<8} {result['total_seconds']:>10.3f}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Time each Day One stage on synthetic caseloads.")
+    parser.add_argument("--sizes", default="94,1000,10000", help="comma-separated caseload sizes (default: 94,1000,10000)")
+    parser.add_argument("--pages", type=int, default=30, help="pages per synthetic IEP (default: 30)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the generator (default: 0)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="extraction processes (default: 1)")
+    parser.add_argument("--workdir", help="where caseloads are generated (default: a temporary folder)")
+    parser.add_argument("--keep", action="store_true", help="leave the generated caseloads on disk")
+    parser.add_argument("--json", help="also write the results to this JSON file")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    except ValueError:
+        parser.error("--sizes must be comma-separated integers")
+    if not sizes or min(sizes) < 1 or args.pages < 5 or args.workers < 1:
+        parser.error("sizes and --workers must be at least 1, --pages at least 5")
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="iep_bench_")
+    os.makedirs(workdir, exist_ok=True)
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'workers': args.workers,
+        'pages_per_iep': args.pages,
+        'seed': args.seed,
+        'results': [],
+    }
+    try:
+        for size in sizes:
+            result = run_size(size, args, workdir)
+            report['results'].append(result)
+            print_result(result)
+    finally:
+        if not args.workdir and not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+import os
+import random
+
+# ------------------------
+# SYNTHETIC IEP PDFS
+# ------------------------
+# Writes IEP-shaped PDFs with no dependencies beyond the standard library, so
+# the benchmarks can build a caseload of any size on any machine. The layout
+# follows the district IEPs the parser was written against: a student header
+# with a 10-digit ID, present levels, one or more Communication domains among
+# other domains, Goal:/Short-term Objectives blocks, then accommodations,
+# assessments and signature pages, with running headers and "Page N of M"
+# footers on every page.
+
+FIRST_NAMES = [
+    "Ava", "Liam", "Mia", "Noah", "Zoe", "Eli", "Maya", "Owen", "Luca", "Nora",
+    "Jaden", "Aria", "Mateo", "Ivy", "Caleb", "Sofia", "Ezra", "Lena", "Kai", "Ruby",
+]
+LAST_NAMES = [
+    "GARCIA", "SMITH", "NGUYEN", "O'BRIEN", "PATEL", "JOHNSON", "LOPEZ", "KIM",
+    "WILLIAMS", "DE LA CRUZ", "BROWN", "MARTIN", "SINGH", "DAVIS", "MOORE", "ST-PIERRE",
+]
+OTHER_DOMAINS = ["Reading", "Mathematics", "Written Expression", "Social/Emotional", "Fine Motor"]
+GOAL_AREAS = [
+    ("produce /r/ in all word positions", "with 80% accuracy given minimal cues"),
+    ("answer wh- questions about a grade level passage", "in 4 of 5 opportunities"),
+    ("retell a story including characters, setting and problem", "with 75% accuracy"),
+    ("use context clues to determine the meaning of unknown words", "in 4 of 5 trials"),
+    ("follow two-step directions with embedded concepts", "with 80% accuracy across sessions"),
+    ("use complete sentences with correct verb tense", "in 8 of 10 opportunities"),
+]
+BENCHMARK_STEPS = [
+    "at the word level", "at the phrase level", "at the sentence level",
+    "in structured conversation", "given a visual model", "given a verbal prompt",
+]
+FILLER = [
+    "The team discussed the student's progress during the current reporting period.",
+    "Parent input was gathered by phone prior to the meeting and is summarized below.",
+    "Data were collected through observation, work samples and curriculum based measures.",
+    "Testing will take place in a small group setting with breaks as needed.",
+    "The student will receive extended time of time and a half on classroom assessments.",
+    "Signature of parent or guardian indicates participation, not agreement.",
+]
+
+
+def escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(path, pages):
+    # pages is a list of pages, each a list of text lines. One Helvetica font,
+    # one content stream per page, lines advanced with T* so text extractors
+    # see them as separate lines.
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for lines in pages:
+        body = "BT /F1 9 Tf 11 TL 36 760 Td\n"
+        body += "".join(f"({escape(line)}) Tj T*\n" for line in lines)
+        body += "ET"
+        data = body.encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(data), data))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def goal_lines(rng, first):
+    action, criterion = rng.choice(GOAL_AREAS)
+    lines = [
+        f"Goal: By the end of the IEP period, {first} will {action}",
+        f"{criterion} as measured by clinician data.",
+        "Short-term Objectives or Benchmarks:",
+    ]
+    for step in rng.sample(BENCHMARK_STEPS, rng.randint(2, 4)):
+        lines.append(f"{first} will {action} {step} {criterion}.")
+    lines.append("Assessment Procedures: clinician observation and data collection")
+    lines.append("Progress Reported: quarterly with report cards")
+    return lines
+
+
+def iep_pages(rng, index, page_count=30):
+    first = rng.choice(FIRST_NAMES)
+    last = rng.choice(LAST_NAMES)
+    student_id = f"{rng.randint(1, 9)}{index:09d}"[-10:]
+
+    body = [
+        [
+            "INDIVIDUALIZED EDUCATION PROGRAM",
+            f"Student: {last}, {first}",
+            f"Student ID: {student_id}",
+            f"Date of Birth: {rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/{rng.randint(2010, 2019)}",
+            f"Meeting Date: {rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2025",
+            f"School Phone: {rng.randint(200, 999)}-555-{rng.randint(1000, 9999)}",
+        ],
+        ["Present Levels of Academic Achievement and Functional Performance"]
+        + [rng.choice(FILLER) for _ in range(rng.randint(10, 25))],
+    ]
+
+    # Communication goals somewhere among the other domains, sometimes twice
+    domains = rng.sample(OTHER_DOMAINS, rng.randint(0, 2)) + ["Communication"] * rng.randint(1, 2)
+    rng.shuffle(domains)
+    for domain in domains:
+        page = [f"Domain(s)/TSAA(s): {domain}"]
+        for _ in range(rng.randint(1, 3)):
+            page += goal_lines(rng, first)
+        body.append(page)
+
+    body.append(["Accommodations"] + [rng.choice(FILLER) for _ in range(rng.randint(8, 20))])
+    body.append(["Assessments"] + [rng.choice(FILLER) for _ in range(rng.randint(8, 20))])
+    while len(body) < page_count - 1:
+        body.append([rng.choice(FILLER) for _ in range(rng.randint(20, 45))])
+    body.append(["Signatures"] + [rng.choice(FILLER) for _ in range(6)])
+
+    # Running header and footer noise on every page, like the exported IEPs
+    total = len(body)
+    return [
+        [f"IEP for {last}, {first}    Confidential"] + lines + [f"Page {number} of {total}"]
+        for number, lines in enumerate(body, 1)
+    ]
+
+
+def generate_caseload(folder, count, seed=0, page_count=30):
+    os.makedirs(folder, exist_ok=True)
+    rng = random.Random(seed)
+    for index in range(count):
+        write_pdf(os.path.join(folder, f"iep_{index:05d}.pdf"), iep_pages(rng, index, page_count))
+    return folder
@@ -0,0 +1,262 @@
+import os
+import json
+import time
+import sqlite3
+from iep_utils import student_key
+
+# ------------------------
+# CASELOAD STORE
+# ------------------------
+# The caseload's system of record, in the caseload folder. Every IEP the
+# pipeline reads is saved as a document with its goals and benchmarks, and
+# each student points at their most recent one. The summary workbook and the
+# student folders are built from here, so nothing ever reads the workbook
+# back, and older IEPs stay on file for reporting across years.
+#
+# A student is their 10-digit ID; students without one are keyed by PDF
+# (see iep_utils.student_key). Reading the same PDF again replaces that
+# document's goals instead of adding a second copy. A student's current IEP is
+# the one with the latest meeting date, so an older IEP read after a newer
+# one is kept on file without taking its place, in this run or any later one
+# (same rules as iep_duplicates: a tie goes to the later read, and a dated
+# IEP wins over one without a date). current_documents() tells the pipeline
+# which of a run's documents that left current.
+#
+# The goals and benchmarks tables hold Communication goals, which everything
+# here is built on; every domain's goals (goal_domains) are also kept with
+# each document as JSON.
+
+STORE_FILENAME = "iep_caseload.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    student_key TEXT PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    current_document INTEGER,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS documents (
+    document_id INTEGER PRIMARY KEY,
+    student_key TEXT NOT NULL,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    filename TEXT,
+    content_hash TEXT,
+    header_id TEXT,
+    meeting_date TEXT,
+    domain_goals TEXT,
+    pages_used TEXT,
+    added REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS goals (
+    document_id INTEGER NOT NULL,
+    goal_index INTEGER NOT NULL,
+    goal TEXT NOT NULL,
+    PRIMARY KEY (document_id, goal_index)
+);
+CREATE TABLE IF NOT EXISTS benchmarks (
+    document_id INTEGER NOT NULL,
+    goal_index INTEGER NOT NULL,
+    benchmark_index INTEGER NOT NULL,
+    benchmark TEXT NOT NULL,
+    PRIMARY KEY (document_id, goal_index, benchmark_index)
+);
+CREATE INDEX IF NOT EXISTS students_student_id ON students (student_id);
+CREATE INDEX IF NOT EXISTS documents_student ON documents (student_key, added);
+CREATE INDEX IF NOT EXISTS documents_content_hash ON documents (content_hash);
+"""
+
+
+def store_path_for(folder):
+    return os.path.join(folder, STORE_FILENAME)
+
+
+class StudentNames:
+    # The {student ID: (first, last)} mapping student_folder_name expects,
+    # answered from the students table one indexed lookup at a time
+    def __init__(self, conn):
+        self.conn = conn
+
+    def get(self, student_id, default=None):
+        row = self.conn.execute(
+            "SELECT first_name, last_name FROM students WHERE student_id = ? AND student_id != 'NoID' LIMIT 1",
+            (student_id,)
+        ).fetchone()
+        return tuple(row) if row else default
+
+    def __contains__(self, student_id):
+        return self.get(student_id) is not None
+
+    def __getitem__(self, student_id):
+        names = self.get(student_id)
+        if names is None:
+            raise KeyError(student_id)
+        return names
+
+
+class CaseloadStore:
+    def __init__(self, folder):
+        self.conn = sqlite3.connect(store_path_for(folder), timeout=30)
+        self.conn.executescript(SCHEMA)
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(documents)")]
+        # Stores made before meeting dates, or other domains, were read
+        for column in ("meeting_date", "domain_goals"):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE documents ADD COLUMN {column} TEXT")
+
+    def add(self, student):
+        # Saves one record and returns its document_id; call inside a transaction
+        key = student_key(student)
+        now = time.time()
+        content_hash = student.get('content_hash')
+        meeting_date = student.get('meeting_date')
+        row = None
+        if content_hash:
+            row = self.conn.execute(
+                "SELECT document_id FROM documents WHERE content_hash = ? AND student_key = ?",
+                (content_hash, key)
+            ).fetchone()
+
+        values = (
+            key, student['first_name'], student['last_name'], student.get('filename'), content_hash,
+            student.get('header_id'), meeting_date, json.dumps(student.get('domains')),
+            json.dumps(student.get('pages_used')), now
+        )
+        if row:
+            document_id = row[0]
+            self.conn.execute(
+                "UPDATE documents SET student_key = ?, first_name = ?, last_name = ?, filename = ?, "
+                "content_hash = ?, header_id = ?, meeting_date = ?, domain_goals = ?, pages_used = ?, added = ? "
+                "WHERE document_id = ?",
+                values + (document_id,)
+            )
+            self.conn.execute("DELETE FROM goals WHERE document_id = ?", (document_id,))
+            self.conn.execute("DELETE FROM benchmarks WHERE document_id = ?", (document_id,))
+        else:
+            document_id = self.conn.execute(
+                "INSERT INTO documents (student_key, first_name, last_name, filename, content_hash, "
+                "header_id, meeting_date, domain_goals, pages_used, added) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                values
+            ).lastrowid
+
+        self.conn.executemany(
+            "INSERT INTO goals (document_id, goal_index, goal) VALUES (?, ?, ?)",
+            [(document_id, g_idx, goal['goal']) for g_idx, goal in enumerate(student['goals'], 1)]
+        )
+        self.conn.executemany(
+            "INSERT INTO benchmarks (document_id, goal_index, benchmark_index, benchmark) VALUES (?, ?, ?, ?)",
+            [
+                (document_id, g_idx, s_idx, subgoal)
+                for g_idx, goal in enumerate(student['goals'], 1)
+                for s_idx, subgoal in enumerate(goal['subgoals'], 1)
+            ]
+        )
+        current = self.conn.execute(
+            "SELECT d.document_id, d.meeting_date FROM students s JOIN documents d "
+            "ON d.document_id = s.current_document WHERE s.student_key = ?",
+            (key,)
+        ).fetchone()
+        if current and current[0] != document_id and (current[1] or "") > (meeting_date or ""):
+            return document_id
+        self.conn.execute(
+            "INSERT OR REPLACE INTO students (student_key, student_id, first_name, last_name, current_document, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, student['id'], student['first_name'], student['last_name'], document_id, now)
+        )
+        return document_id
+
+    def save(self, records):
+        # All or nothing: a run that fails halfway leaves the store as it was.
+        # records may be a generator; returns the document_ids in order.
+        with self.conn:
+            return [self.add(student) for student in records]
+
+    def record(self, document_id):
+        # The record the pipeline saved, rebuilt from the tables
+        row = self.conn.execute(
+            "SELECT d.first_name, d.last_name, s.student_id, d.header_id, d.filename, d.content_hash, d.pages_used, "
+            "d.meeting_date, d.domain_goals "
+            "FROM documents d JOIN students s ON s.student_key = d.student_key WHERE d.document_id = ?",
+            (document_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        goals = [
+            {'goal': goal, 'subgoals': []}
+            for (goal,) in self.conn.execute(
+                "SELECT goal FROM goals WHERE document_id = ? ORDER BY goal_index", (document_id,)
+            )
+        ]
+        for g_idx, benchmark in self.conn.execute(
+            "SELECT goal_index, benchmark FROM benchmarks WHERE document_id = ? ORDER BY goal_index, benchmark_index",
+            (document_id,)
+        ):
+            goals[g_idx - 1]['subgoals'].append(benchmark)
+        return {
+            'first_name': row[0],
+            'last_name': row[1],
+            'id': row[2],
+            'header_id': row[3],
+            'filename': row[4],
+            'content_hash': row[5],
+            'pages_used': json.loads(row[6]),
+            'meeting_date': row[7],
+            'domains': json.loads(row[8]) if row[8] else None,
+            'goals': goals,
+        }
+
+    def records(self, document_ids=None):
+        # Yields records one at a time; by default every student's current IEP
+        if document_ids is None:
+            document_ids = [row[0] for row in self.conn.execute(
+                "SELECT current_document FROM students ORDER BY last_name, first_name"
+            )]
+        for document_id in document_ids:
+            yield self.record(document_id)
+
+    def current_documents(self, document_ids):
+        # The document_ids that are their student's current IEP, in order, once each
+        current = {row[0] for row in self.conn.execute("SELECT current_document FROM students")}
+        kept = []
+        for document_id in document_ids:
+            if document_id in current:
+                kept.append(document_id)
+                current.discard(document_id)
+        return kept
+
+    def current_document(self, student):
+        row = self.conn.execute(
+            "SELECT current_document FROM students WHERE student_key = ?", (student_key(student),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def current_record(self, student_id):
+        # The student's current IEP, or None for an ID that isn't in the caseload
+        row = self.conn.execute(
+            "SELECT current_document FROM students WHERE student_id = ? AND student_id != 'NoID' LIMIT 1",
+            (student_id,)
+        ).fetchone()
+        return self.record(row[0]) if row else None
+
+    def documents_for(self, student_id):
+        # Every IEP on file for a student, oldest first
+        return [row[0] for row in self.conn.execute(
+            "SELECT d.document_id FROM documents d JOIN students s ON s.student_key = d.student_key "
+            "WHERE s.student_id = ? ORDER BY d.added",
+            (student_id,)
+        )]
+
+    def names(self):
+        return StudentNames(self.conn)
+
+    def close(self):
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
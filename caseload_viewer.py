@@ -0,0 +1,174 @@
+import os
+import time
+import tkinter as tk
+from goal_index import WORKBOOK_FILENAME, GoalIndex, index_path_for
+
+# ------------------------
+# CASELOAD VIEWER
+# ------------------------
+# A window for looking up any student's goals: type a name, an ID or goal
+# words ("artic /r/") and the list narrows as you type. The list only ever
+# holds the rows that fit on screen and redraws them as it scrolls, so a
+# 10,000-student district scrolls as smoothly as one caseload.
+
+VISIBLE_ROWS = 18
+
+
+def load_caseload_index(folder):
+    # Folders filed before the index existed only have the workbook, so the
+    # index is built from it once and saved for next time
+    excel_path = os.path.join(folder, WORKBOOK_FILENAME)
+    index_path = index_path_for(excel_path)
+    index = GoalIndex.load(index_path)
+    if not len(index) and os.path.exists(excel_path):
+        from goals_workbook import read_goals_workbook
+        index.update(read_goals_workbook(excel_path))
+        index.save(index_path)
+    return index
+
+
+class VirtualList:
+    def __init__(self, parent, rows=VISIBLE_ROWS, on_select=None):
+        self.rows = rows
+        self.on_select = on_select
+        self.items = []
+        self.label = str
+        self.top = 0
+        self.selected = None
+
+        self.frame = tk.Frame(parent)
+        self.listbox = tk.Listbox(self.frame, height=rows, width=40, activestyle="none", exportselection=False)
+        self.scrollbar = tk.Scrollbar(self.frame, orient="vertical", command=self.scroll)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.listbox.bind("<<ListboxSelect>>", self.clicked)
+        self.listbox.bind("<MouseWheel>", lambda e: self.scroll_by(-1 if e.delta > 0 else 1, 3))
+        self.listbox.bind("<Button-4>", lambda e: self.scroll_by(-1, 3))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll_by(1, 3))
+        self.listbox.bind("<Up>", lambda e: self.move(-1))
+        self.listbox.bind("<Down>", lambda e: self.move(1))
+        self.listbox.bind("<Prior>", lambda e: self.move(-self.rows))
+        self.listbox.bind("<Next>", lambda e: self.move(self.rows))
+
+    def set_items(self, items, label=str):
+        self.items = items
+        self.label = label
+        self.top = 0
+        self.selected = None
+        self.render()
+
+    def render(self):
+        # Only the visible slice goes into the Listbox; labels are made on demand
+        end = min(self.top + self.rows, len(self.items))
+        self.listbox.delete(0, "end")
+        for item in self.items[self.top:end]:
+            self.listbox.insert("end", self.label(item))
+        if self.selected is not None and self.top <= self.selected < end:
+            self.listbox.selection_set(self.selected - self.top)
+        if self.items:
+            self.scrollbar.set(self.top / len(self.items), end / len(self.items))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, top):
+        top = max(0, min(top, len(self.items) - self.rows))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def scroll_by(self, direction, count):
+        self.scroll_to(self.top + direction * count)
+        return "break"
+
+    def scroll(self, action, amount, unit=None):
+        # Same arguments a Scrollbar passes to a widget's yview
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.items)))
+        else:
+            step = self.rows if unit == "pages" else 1
+            self.scroll_by(int(amount), step)
+
+    def select(self, position):
+        if not self.items:
+            return
+        self.selected = max(0, min(position, len(self.items) - 1))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.rows:
+            self.top = self.selected - self.rows + 1
+        self.render()
+        if self.on_select:
+            self.on_select(self.items[self.selected])
+
+    def move(self, delta):
+        self.select(delta if self.selected is None else self.selected + delta)
+        return "break"
+
+    def clicked(self, event):
+        picked = self.listbox.curselection()
+        if picked and self.top + picked[0] != self.selected:
+            self.select(self.top + picked[0])
+
+
+def student_label(student):
+    return f"{student['last_name']}, {student['first_name']}  ({student['id']})"
+
+
+def goals_text(student):
+    lines = [f"{student['first_name']} {student['last_name']}", f"Student ID: {student['id']}"]
+    if student.get('filename'):
+        lines.append(f"IEP: {student['filename']}")
+    if not student['goals']:
+        lines += ["", "No Communication goals found."]
+    for g_idx, goal in enumerate(student['goals'], 1):
+        lines += ["", f"Goal {g_idx}", goal['goal']]
+        for s_idx, subgoal in enumerate(goal['subgoals'], 1):
+            lines.append(f"  {g_idx}.{s_idx}  {subgoal}")
+    return "\n".join(lines)
+
+
+def open_caseload_viewer(root, folder):
+    index = load_caseload_index(folder)
+
+    window = tk.Toplevel(root)
+    window.title(f"Caseload Goals - {os.path.basename(os.path.normpath(folder))}")
+    window.geometry("900x460")
+
+    search_var = tk.StringVar()
+    count_var = tk.StringVar()
+    top_frame = tk.Frame(window)
+    top_frame.pack(fill="x", padx=10, pady=(10, 5))
+    tk.Label(top_frame, text="Search name, ID or goal words:").pack(side="left")
+    entry = tk.Entry(top_frame, textvariable=search_var, width=40)
+    entry.pack(side="left", padx=5, fill="x", expand=True)
+    tk.Label(top_frame, textvariable=count_var).pack(side="right")
+
+    body = tk.Frame(window)
+    body.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+    details = tk.Text(body, wrap="word", state="disabled", width=60)
+
+    def show(key):
+        details.configure(state="normal")
+        details.delete("1.0", "end")
+        details.insert("1.0", goals_text(index.student(key)))
+        details.configure(state="disabled")
+
+    results = VirtualList(body, on_select=show)
+    results.frame.pack(side="left", fill="y")
+    details.pack(side="right", fill="both", expand=True, padx=(10, 0))
+
+    def refresh(*_):
+        started = time.perf_counter()
+        keys = index.search(search_var.get())
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        results.set_items(keys, lambda key: student_label(index.student(key)))
+        count_var.set(f"{len(keys)} of {len(index)} students  ({elapsed_ms:.1f} ms)")
+        if keys:
+            results.select(0)
+
+    search_var.trace_add("write", refresh)
+    entry.bind("<Down>", lambda e: results.listbox.focus_set())
+    entry.focus_set()
+    refresh()
+    return window
@@ -0,0 +1,702 @@
+import os
+import re
+import time
+import shutil
+import functools
+from extraction_cache import ExtractionCache, file_hash, read_iep_pages
+from iep_document import IEPDocument
+from parse_guard import PARSE_BUDGET_SECONDS, Deadline, ParseBudgetExceeded, bounded_pages, shape_warnings
+from iep_duplicates import drop_superseded, skip_identical, split_superseded
+from goal_domains import DEFAULT_DOMAIN, DEFAULT_DOMAINS, KNOWN_DOMAINS, domain_path, domain_records, goals_for
+from pdf_backends import DEFAULT_BACKEND, select_backend
+from run_report import REPORT_FILENAME, RunReport, measure, stage_timer
+from docx_templates import GOALS_TEMPLATE_FILENAME, NOTE_TEMPLATE_FILENAME, DocxTemplate, find_template
+from goal_index import index_path_for, update_goal_index
+from caseload_store import CaseloadStore
+from job_journal import JobJournal, journal_pending
+from iep_utils import atomic_output
+
+# ------------------------
+# DAY ONE PIPELINE
+# ------------------------
+# Everything Day One does to a folder of IEPs, with no window: extraction,
+# the caseload store and workbooks, the goal and note documents, filing, the
+# job journal and watch mode. Both GUI scripts, iep_cli.py and the tools
+# built on it import it from here, so none of them needs tkinter to run.
+
+# ------------------------
+# EXCEL EXTRACTION SECTION
+# ------------------------
+
+# Every pattern the goal parser needs, compiled once. The *_LINE patterns are
+# only tried with match() at the start of a line, which is what the leading
+# "\n" in the old whole-text regexes meant.
+SECTION_END_LINE = re.compile(r"Domain\(s\)|Assessments|Accommodations", re.IGNORECASE)
+PAGE_BREAK = re.compile(r"Page \d", re.IGNORECASE)
+GOAL_MARKER = re.compile(r"\bGoal:\s*", re.IGNORECASE)
+LEADING_SPACE = re.compile(r"\s*")
+GOAL_TEXT_END = re.compile(r"Assessment Procedures|Progress Reported", re.IGNORECASE)
+GOAL_TEXT_END_LINE = re.compile(r"Short-term Objectives|[A-Z][a-z]+:", re.IGNORECASE)
+BENCHMARK_HEADER = re.compile(r"Short-term Objectives or Benchmarks:", re.IGNORECASE)
+SUBGOAL_EXCLUDE = re.compile(r"(student be|participate|assessment|instruction|comment)", re.IGNORECASE)
+
+def subgoal_lines(fragment):
+    subgoals = []
+    for line in fragment.splitlines():
+        line = line.strip()
+        if (
+            " will " in line.lower() and
+            len(line.split()) > 5 and
+            not SUBGOAL_EXCLUDE.search(line)
+        ):
+            subgoals.append(line)
+    return subgoals
+
+def feed_goal(goal, segment, line_start):
+    # The goal statement runs until the first end marker
+    if not goal['statement_done']:
+        if line_start and GOAL_TEXT_END_LINE.match(segment):
+            goal['statement_done'] = True
+        else:
+            end = GOAL_TEXT_END.search(segment)
+            goal['statement'].append(segment[:end.start()] if end else segment)
+            goal['statement_done'] = end is not None
+
+    # Every will-statement in the goal is a fallback benchmark
+    kept = subgoal_lines(segment)
+    goal['fallback'].extend(kept)
+
+    # A benchmark block only ends at the next benchmark header on a new line,
+    # or at a newline ending the goal; one still open when the goal ends without
+    # a newline never counted, so its lines wait in 'pending' until then
+    if not goal['in_benchmarks']:
+        header = BENCHMARK_HEADER.search(segment)
+        if header:
+            goal['in_benchmarks'] = True
+            goal['pending'].extend(subgoal_lines(segment[header.end():]))
+    else:
+        header = BENCHMARK_HEADER.match(segment) if line_start else None
+        if header:
+            goal['benchmarks'].extend(goal['pending'])
+            goal['pending'] = subgoal_lines(segment[header.end():])
+        else:
+            goal['pending'].extend(kept)
+
+    goal['ends_with_newline'] = line_start and segment == ""
+
+def finish_goal(goal, results):
+    if goal['ends_with_newline']:
+        goal['benchmarks'].extend(goal['pending'])
+    goal_text = "\n".join(goal['statement']).strip().replace('\n', ' ')
+    if goal_text:
+        results.append({
+            "goal": goal_text,
+            "subgoals": goal['benchmarks'] or goal['fallback']
+        })
+
+def feed_section(section, fragment, line_start, results):
+    pos = 0
+    while True:
+        if section['after_marker']:
+            # "Goal:" swallows the whitespace after it, even across lines
+            pos = LEADING_SPACE.match(fragment, pos).end()
+            if pos == len(fragment):
+                return
+            section['after_marker'] = False
+            section['goal'] = {
+                'statement': [], 'statement_done': False, 'fallback': [],
+                'benchmarks': [], 'pending': [], 'in_benchmarks': False,
+                'ends_with_newline': False
+            }
+            line_start = False
+
+        marker = GOAL_MARKER.search(fragment, pos)
+        if section['goal'] is not None:
+            segment = fragment[pos:marker.start()] if marker else fragment[pos:]
+            feed_goal(section['goal'], segment, line_start)
+        if not marker:
+            return
+
+        if section['goal'] is not None:
+            finish_goal(section['goal'], results)
+            section['goal'] = None
+        section['after_marker'] = True
+        pos = marker.end()
+
+def finish_section(section, results):
+    if section['goal'] is not None:
+        finish_goal(section['goal'], results)
+
+def scan_section(text, start, results, deadline=None):
+    # Walks one domain section line by line from just after its header
+    # and returns where it ended, which is where the next header search resumes
+    section = {'goal': None, 'after_marker': False}
+    line_start = False
+    while True:
+        if deadline:
+            deadline.check()
+        eol = text.find("\n", start)
+        if eol == -1:
+            eol = len(text)
+
+        if line_start and SECTION_END_LINE.match(text, start):
+            finish_section(section, results)
+            return start - 1
+
+        page = PAGE_BREAK.search(text, start, eol)
+        if page:
+            feed_section(section, text[start:page.start()], line_start, results)
+            finish_section(section, results)
+            return page.start()
+
+        feed_section(section, text[start:eol], line_start, results)
+        if eol == len(text):
+            finish_section(section, results)
+            return eol
+        start = eol + 1
+        line_start = True
+
+def domain_heading(text, section, domains=None):
+    # (domain, where its text starts) for a domain header, or (None, None)
+    # when it isn't one of domains. Without domains, a header that isn't one
+    # of the TSAA domains is named by its own text (which stops at the end of
+    # the line or the next header), up to anything the section scan has to see.
+    name = section['name'].lower()
+    for domain in domains or KNOWN_DOMAINS:
+        if name.startswith(domain.lower()):
+            return domain, section['name_start'] + len(domain)
+    if domains:
+        return None, None
+
+    start = section['name_start']
+    line = section['name']
+    cut = min(
+        (m.start() for m in (GOAL_MARKER.search(line), PAGE_BREAK.search(line)) if m),
+        default=len(line)
+    )
+    return " ".join(line[:cut].split()) or "Other", start + cut
+
+def extract_domain_goals(doc, domains=None, deadline=None):
+    # {domain: goals} in one forward pass: jump between the document's indexed
+    # domain headers, and inside each section split goals and benchmark blocks
+    # as the lines go by. A header inside a section of the same domain already
+    # read is skipped, so each domain comes out as if it were parsed on its own.
+    results = {}
+    ends = {}
+    for section in doc.sections:
+        if section['kind'] != "domain":
+            continue
+        domain, text_start = domain_heading(doc.text, section, domains)
+        if domain is None or section['start'] < ends.get(domain, 0):
+            continue
+        ends[domain] = scan_section(doc.text, text_start, results.setdefault(domain, []), deadline)
+    return results
+
+def extract_document_goals(doc):
+    return extract_domain_goals(doc, DEFAULT_DOMAINS).get(DEFAULT_DOMAIN, [])
+
+def extract_communication_goals(text, student_name=None):
+    return extract_document_goals(IEPDocument.from_text(text))
+
+# Bump when the parsing below changes so cached results get re-parsed
+PARSER_VERSION = "day-one-7"
+
+def parse_student_header(doc):
+    # The name and both IDs come from the student header only; see iep_document
+    first_name, last_name = doc.student_name()
+    return {
+        'first_name': first_name,
+        'last_name': last_name,
+        'id': doc.student_id(),
+        'header_id': doc.header_id(),
+        'meeting_date': doc.meeting_date()
+    }
+
+def parse_student_document(doc, deadline=None):
+    record = parse_student_header(doc)
+    domains = extract_domain_goals(doc, deadline=deadline)
+    record['goals'] = domains.get(DEFAULT_DOMAIN, [])
+    record['domains'] = domains
+    return record
+
+def parse_student_text(text):
+    return parse_student_document(IEPDocument.from_text(text))
+
+def parse_student_pages(pages, budget=PARSE_BUDGET_SECONDS):
+    # Guarded against malformed text; see parse_guard. Anything unusual about
+    # the document ends up in 'parse_warnings'.
+    warnings = shape_warnings(pages)
+    if warnings:
+        pages = bounded_pages(pages)
+    doc = IEPDocument(pages)
+    try:
+        record = parse_student_document(doc, Deadline(budget))
+    except ParseBudgetExceeded:
+        warnings.append(f"goals not read: parsing took over {budget:g}s of CPU")
+        record = parse_student_header(doc)
+        record['goals'] = []
+        record['domains'] = {}
+    if not doc.sections:
+        warnings.append("no Domain(s)/TSAA(s), Assessments or Accommodations headers")
+    record['pages_used'] = doc.pages_used
+    record['parse_warnings'] = warnings
+    return record
+
+def extract_student_record(path, backend=DEFAULT_BACKEND):
+    pages = read_iep_pages(path, backend)
+    return pages, parse_student_pages(pages)
+
+def extract_measured_record(path, track_memory=False, backend=DEFAULT_BACKEND):
+    # Same as extract_student_record, plus the timings for the run report
+    timings = {}
+    with measure(timings, "pdf_text", track_memory):
+        pages = read_iep_pages(path, backend)
+    with measure(timings, "parse", track_memory):
+        record = parse_student_pages(pages)
+    return pages, record, timings
+
+class RunCancelled(Exception):
+    pass
+
+def report(progress, stage, done, total, filename=None):
+    if progress:
+        progress(stage, done, total, filename)
+
+def calibration_parse(pages):
+    # What a faster PDF backend has to agree with PyPDF2 on; see pdf_backends
+    return parse_student_document(IEPDocument(pages))
+
+def iter_caseload(pdf_folder, workers=1, use_cache=True, filenames=None, progress=None, cancel=None,
+                  run_report=None, backend=None):
+    # Yields one record per PDF, in listdir order, as soon as it's ready, so the
+    # workbook can be written without holding the whole caseload in memory.
+    # Copies of a PDF already in the list are never read; see iep_duplicates.
+    if filenames is None:
+        filenames = [f for f in os.listdir(pdf_folder) if f.lower().endswith(".pdf")]
+    paths = [os.path.join(pdf_folder, filename) for filename in filenames]
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    cache = ExtractionCache(pdf_folder) if use_cache else None
+    try:
+        hashes = [file_hash(path) for path in paths]
+        paths, hashes, duplicates = skip_identical(paths, hashes)
+
+        # Only PDFs the cache has never seen are extracted; cached ones are
+        # read back one at a time when their turn comes
+        cached = [cache is not None and cache.contains(h) for h in hashes]
+        todo_paths = [path for path, hit in zip(paths, cached) if not hit]
+
+        # None picks the fastest installed backend for this caseload's PDFs; a
+        # run without the cache leaves nothing in the folder, its choice included
+        if backend is None:
+            backend = select_backend(pdf_folder, todo_paths, read_iep_pages, calibration_parse, save=use_cache)
+        extract = functools.partial(extract_student_record, backend=backend)
+        if run_report:
+            extract = functools.partial(extract_measured_record, track_memory=run_report.track_memory, backend=backend)
+
+        pool = None
+        if workers > 1 and len(todo_paths) > 1:
+            # map() yields in listdir order regardless of which worker finishes first,
+            # so the workbook rows come out the same as a serial run
+            from concurrent.futures import ProcessPoolExecutor
+            chunksize = max(1, len(todo_paths) // (workers * 4))
+            pool = ProcessPoolExecutor(max_workers=workers)
+            extracted = pool.map(extract, todo_paths, chunksize=chunksize)
+        else:
+            extracted = map(extract, todo_paths)
+
+        try:
+            report(progress, "Reading", 0, len(paths))
+            for done, (path, content_hash, hit) in enumerate(zip(paths, hashes, cached), 1):
+                filename = os.path.basename(path)
+                if hit:
+                    pages, record = cache.get(content_hash, PARSER_VERSION)
+                    if record is None:
+                        with stage_timer(run_report, "parse", filename):
+                            record = parse_student_pages(pages)
+                        cache.put(content_hash, PARSER_VERSION, pages, record)
+                    elif run_report:
+                        run_report.mark_cached(filename)
+                else:
+                    result = next(extracted)
+                    pages, record = result[:2]
+                    if run_report:
+                        run_report.add(filename, result[2])
+                    if cache:
+                        cache.put(content_hash, PARSER_VERSION, pages, record)
+
+                record['filename'] = filename
+                record['content_hash'] = content_hash
+                record['duplicates'] = duplicates.get(filename, [])
+                if run_report and record.get('parse_warnings'):
+                    run_report.flag(filename, record['parse_warnings'])
+                report(progress, "Reading", done, len(paths), filename)
+                if cancel and cancel.is_set():
+                    raise RunCancelled()
+                yield record
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
+    finally:
+        # Whatever was extracted before a cancel stays cached for the next run
+        if cache:
+            cache.close()
+
+def extract_caseload(pdf_folder, workers=1, use_cache=True, filenames=None, progress=None, cancel=None,
+                     run_report=None, backend=None):
+    # One record per student: their most recent IEP in these files
+    records = list(iter_caseload(pdf_folder, workers, use_cache, filenames, progress, cancel, run_report, backend))
+    return drop_superseded(records, run_report)
+
+def write_goals_excel(records, output_excel_path, run_report=None):
+    # records may be a generator; see goals_workbook for how rows are streamed
+    from goals_workbook import write_goals_workbook
+    with stage_timer(run_report, "excel"):
+        return write_goals_workbook(records, output_excel_path)
+
+def update_goals_excel(records, output_excel_path):
+    # Adds or replaces just these students' rows in an existing summary,
+    # inserting Goal/Benchmark columns where the layout needs to grow
+    if not os.path.exists(output_excel_path):
+        return write_goals_excel(records, output_excel_path)
+
+    from openpyxl import load_workbook
+    wb = load_workbook(output_excel_path)
+    ws = wb.active
+    header = [cell.value for cell in ws[1]]
+
+    for student in records:
+        for g_idx, goal in enumerate(student['goals']):
+            goal_col = f'Goal {g_idx+1}'
+            if goal_col not in header:
+                header.append(goal_col)
+                ws.cell(row=1, column=len(header), value=goal_col)
+            for s_idx in range(len(goal['subgoals'])):
+                bench_col = f'Benchmark {g_idx+1}.{s_idx+1}'
+                if bench_col in header:
+                    continue
+                # New benchmark columns go straight after the goal's existing ones
+                prev_col = f'Benchmark {g_idx+1}.{s_idx}' if s_idx else goal_col
+                insert_at = header.index(prev_col) + 1
+                header.insert(insert_at, bench_col)
+                ws.insert_cols(insert_at + 1)
+                ws.cell(row=1, column=insert_at + 1, value=bench_col)
+
+    columns = {name: idx for idx, name in enumerate(header, 1)}
+    id_col = columns['Student ID']
+    rows_by_id = {
+        str(ws.cell(row=r, column=id_col).value): r
+        for r in range(2, ws.max_row + 1)
+    }
+
+    for student in records:
+        if student['id'] != "NoID" and student['id'] in rows_by_id:
+            row_idx = rows_by_id[student['id']]
+        else:
+            row_idx = ws.max_row + 1
+            rows_by_id[student['id']] = row_idx
+
+        values = {
+            'First Name': student['first_name'],
+            'Last Name': student['last_name'],
+            'Student ID': student['id']
+        }
+        for g_idx, goal in enumerate(student['goals']):
+            values[f'Goal {g_idx+1}'] = goal['goal']
+            for s_idx, subgoal in enumerate(goal['subgoals']):
+                values[f'Benchmark {g_idx+1}.{s_idx+1}'] = subgoal
+        for name, col in columns.items():
+            # Assign through .value: cell(value=None) would leave an old benchmark behind
+            ws.cell(row=row_idx, column=col).value = values.get(name)
+
+    with atomic_output(output_excel_path) as temp_path:
+        wb.save(temp_path)
+    return output_excel_path
+
+def write_domain_workbooks(records, output_excel_path, domains, run_report=None):
+    # Communication's workbook is written from the store by the caller
+    for domain in domains:
+        if domain != DEFAULT_DOMAIN:
+            write_goals_excel(domain_records(records, domain), domain_path(output_excel_path, domain), run_report)
+
+def analyze_pdfs_and_generate_excel(pdf_folder, output_excel_path, workers=1, use_cache=True, domains=DEFAULT_DOMAINS):
+    # Each student goes straight from extraction into the caseload store, and
+    # the workbooks are streamed back out of it. The store decides which IEP
+    # is each student's current one, so superseded IEPs need no second pass.
+    with CaseloadStore(pdf_folder) as store:
+        document_ids = store.current_documents(store.save(iter_caseload(pdf_folder, workers, use_cache)))
+        for domain in domains:
+            if domain != DEFAULT_DOMAIN:
+                write_goals_excel(domain_records(store.records(document_ids), domain), domain_path(output_excel_path, domain))
+        return write_goals_excel(store.records(document_ids), output_excel_path)
+
+# ------------------------
+# DOCX FOLDER GENERATION
+# ------------------------
+
+def clean_action(text):
+    text = text.strip().replace("\n", " ")
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"[.]+", "", text)
+    match = re.search(r"will\s+(.*?)(?=\s*(with|given|in)\b|\d{1,3}%|$)", text, re.IGNORECASE)
+    return match.group(1).strip().capitalize() if match else None
+
+NOTE_INTRO = "Student was pulled-out and treated in therapy room setting and actively participated in an activity centered around a non-fiction grade level passage about the [ topic of passage ]"
+
+# Templates are loaded once and reused across runs. Keyed by path and mtime,
+# so an edited goals_template.docx / note_template.docx is picked up next run.
+doc_templates = {}
+
+def load_doc_templates(folder=None):
+    goals_path = find_template(folder, GOALS_TEMPLATE_FILENAME)
+    note_path = find_template(folder, NOTE_TEMPLATE_FILENAME)
+    key = tuple((path, os.path.getmtime(path) if path else None) for path in (goals_path, note_path))
+    if key not in doc_templates:
+        note = DocxTemplate(note_path)
+        note.add_boilerplate([note.heading("Note", level=1)] + note_preamble(note))
+        doc_templates[key] = {'goals': DocxTemplate(goals_path), 'note': note}
+    return doc_templates[key]
+
+def create_goal_doc(goals_data, folder_path, templates=None, filename="goals.docx"):
+    doc = (templates or load_doc_templates())['goals']
+    paragraphs = []
+    for i, item in enumerate(goals_data, 1):
+        paragraphs.append(doc.heading(f"Goal {i}", level=1))
+        paragraphs.append(doc.paragraph(item['goal']))
+        if item['subgoals']:
+            paragraphs.append(doc.heading("Benchmarks", level=2))
+            for b in item['subgoals']:
+                paragraphs.append(doc.paragraph(b))
+    doc.save(paragraphs, os.path.join(folder_path, filename))
+
+def note_preamble(doc):
+    # The session description every note opens with, before the student's part
+    return [doc.paragraph(NOTE_INTRO), doc.paragraph("Utilizing the passage:")]
+
+def note_paragraphs(doc, first_name, goals_data):
+    # The student's part of a note; session_notes reuses it for every session
+    paragraphs = []
+    for item in goals_data:
+        for i, b in enumerate(item['subgoals']):
+            action = clean_action(b)
+            if action:
+                paragraphs.append(doc.paragraph(f"{first_name} achieved [ subgoal {i+1} percentage accuracy ] accuracy in being able to {action}."))
+    paragraphs.append(doc.paragraph(f"{first_name} will continue current plan and using context clues to determine meaning."))
+    return paragraphs
+
+def create_note_doc(first_name, goals_data, folder_path, templates=None):
+    doc = (templates or load_doc_templates())['note']
+    doc.save(note_paragraphs(doc, first_name, goals_data), os.path.join(folder_path, "note.docx"))
+
+def build_name_lookup(records):
+    # The store's names for just these records, for runs that don't save them
+    return {
+        student['id']: (student['first_name'], student['last_name'])
+        for student in records
+    }
+
+def student_folder_name(student, name_lookup):
+    student_id = student['header_id']
+    if not student_id or student_id not in name_lookup:
+        first_name, last_name = "Unknown", "Student"
+    else:
+        first_name, last_name = name_lookup[student_id]
+
+    safe_name = f"{first_name}_{last_name}".replace(" ", "_")
+    return first_name, f"{safe_name}_{student_id}"
+
+def file_pdf(folder, filename, student_folder, journal=None):
+    # With a journal the move is logged, and synced, before it happens, so a
+    # resumed run can tell a PDF that was already moved from one that's lost.
+    # Returns False for a journaled PDF that's gone: it's logged as missing
+    # and skipped, so one deleted file can't leave the run stuck.
+    source = os.path.join(folder, filename)
+    target = os.path.join(student_folder, filename)
+    if journal:
+        if not os.path.exists(source):
+            moving = journal.detail(filename, "moving")
+            if os.path.exists(target) or (moving and os.path.exists(moving['target'])):
+                journal.step(filename, "moved")
+                return True
+            journal.step(filename, "missing")
+            return False
+        journal.step(filename, "moving", sync=True, target=target)
+    shutil.move(source, target)
+    if journal:
+        journal.step(filename, "moved")
+    return True
+
+def file_duplicates(folder, student, student_folder):
+    # PDFs skipped in favour of this one go in the same folder. Any already
+    # moved by an interrupted run are simply gone from the top level.
+    for duplicate in student.get('duplicates', ()):
+        source = os.path.join(folder, duplicate['filename'])
+        if os.path.exists(source):
+            shutil.move(source, os.path.join(student_folder, duplicate['filename']))
+
+def generate_docx_files(folder, records=None, progress=None, cancel=None, run_report=None, store=None,
+                        journal=None, domains=DEFAULT_DOMAINS):
+    # Folder names come from the caseload store. Without records, the PDFs
+    # still in the folder are read and saved to the store first. With a
+    # journal, students it has already filed are skipped. Each domain besides
+    # Communication adds its own goals document; see goal_domains. Records
+    # marked superseded_by (see split_superseded) are filed without documents.
+    if store is None:
+        with CaseloadStore(folder) as store:
+            return generate_docx_files(folder, records, progress, cancel, run_report, store, journal, domains)
+    if records is None:
+        records = extract_caseload(folder)
+        records, _, superseded = split_superseded(records, store.save(records), store, run_report)
+        records += superseded
+    name_lookup = store.names()
+
+    templates = load_doc_templates(folder)
+    report(progress, "Filing", 0, len(records))
+    for done, student in enumerate(records, 1):
+        # Stop between students, never halfway through filing one
+        if cancel and cancel.is_set():
+            raise RunCancelled()
+
+        filename = student['filename']
+        if journal and (journal.done(filename, "moved") or journal.done(filename, "missing")):
+            report(progress, "Filing", done, len(records), filename)
+            continue
+
+        first_name, folder_name = student_folder_name(student, name_lookup)
+        student_folder = os.path.join(folder, folder_name)
+        os.makedirs(student_folder, exist_ok=True)
+
+        if not student.get('superseded_by') and not (journal and journal.done(filename, "docs")):
+            goals_data = student['goals']
+            with stage_timer(run_report, "docx", filename):
+                create_goal_doc(goals_data, student_folder, templates)
+                create_note_doc(first_name, goals_data, student_folder, templates)
+                for domain in domains:
+                    domain_goals = goals_for(student, domain)
+                    if domain != DEFAULT_DOMAIN and domain_goals:
+                        create_goal_doc(domain_goals, student_folder, templates, domain_path("goals.docx", domain))
+            if journal:
+                journal.step(filename, "docs")
+
+        with stage_timer(run_report, "move", filename):
+            file_duplicates(folder, student, student_folder)
+            filed = file_pdf(folder, filename, student_folder, journal)
+        if not filed and run_report:
+            run_report.missing_pdf(filename)
+        report(progress, "Filing", done, len(records), filename)
+
+def start_or_resume(folder, store, journal, extract, run_report=None):
+    # Returns this run's (records, document_ids). An unfinished journal is
+    # resumed: its students come back from the store rather than their PDFs,
+    # and only PDFs that turned up since are read. extract(filenames) reads
+    # the given PDFs, or every PDF in the folder for None.
+    if journal.unfinished():
+        document_ids = journal.document_ids()
+        records = list(store.records(document_ids))
+        if None not in records:
+            for record, duplicates in zip(records, journal.duplicates()):
+                record['duplicates'] = duplicates
+            known = set(journal.filenames())
+            new = [f for f in os.listdir(folder) if f.lower().endswith(".pdf") and f not in known]
+            if new:
+                added = extract(new)
+                with stage_timer(run_report, "store"):
+                    added_ids = store.save(added)
+                journal.add(added, added_ids)
+                records += added
+                document_ids += added_ids
+            return records, document_ids
+        # The store was replaced since; nothing to resume from
+        journal.finish()
+
+    records = extract(None)
+    with stage_timer(run_report, "store"):
+        document_ids = store.save(records)
+    journal.start(records, document_ids)
+    return records, document_ids
+
+def process_day_one(folder, workers=1, use_cache=True, progress=None, cancel=None, run_report=None,
+                    domains=DEFAULT_DOMAINS):
+    # Each PDF is read and parsed once; the same records feed the Excel and DOCX
+    # steps. A cancelled or crashed run is finished by the next one; see job_journal.
+    if run_report is None:
+        run_report = RunReport()
+    output_excel = os.path.join(folder, "iep_goals_summary.xlsx")
+
+    def extract(filenames):
+        return extract_caseload(folder, workers, use_cache, filenames, progress, cancel, run_report)
+
+    try:
+        with CaseloadStore(folder) as store:
+            journal = JobJournal(folder)
+            try:
+                records, document_ids = start_or_resume(folder, store, journal, extract, run_report)
+                # An IEP older than one filed by an earlier run is only filed
+                records, document_ids, superseded = split_superseded(records, document_ids, store, run_report)
+                if records:
+                    write_goals_excel(store.records(document_ids), output_excel, run_report)
+                    write_domain_workbooks(records, output_excel, domains, run_report)
+                    # Students filed by earlier runs stay in the index
+                    with stage_timer(run_report, "index"):
+                        update_goal_index(records, index_path_for(output_excel))
+                generate_docx_files(folder, records + superseded, progress, cancel, run_report, store, journal, domains)
+                journal.finish()
+            finally:
+                journal.close()
+    finally:
+        # Written even for a cancelled or failed run, which is when it's most useful
+        run_report.write(os.path.join(folder, REPORT_FILENAME))
+        run_report.close()
+    return output_excel
+
+# ------------------------
+# WATCH MODE
+# ------------------------
+
+def find_ready_pdfs(folder, sizes):
+    # Filed PDFs live in student folders, so anything left at the top level is
+    # new. A file is only ready once its size holds steady between two polls,
+    # which keeps us from reading a PDF that is still being copied in. While
+    # an interrupted Day One run is unfinished, its PDFs are left for it.
+    if journal_pending(folder):
+        sizes.clear()
+        return []
+    ready = []
+    current = {}
+    for filename in os.listdir(folder):
+        if not filename.lower().endswith(".pdf"):
+            continue
+        try:
+            size = os.path.getsize(os.path.join(folder, filename))
+        except OSError:
+            continue
+        current[filename] = size
+        if sizes.get(filename) == size:
+            ready.append(filename)
+    sizes.clear()
+    sizes.update(current)
+    return sorted(ready)
+
+def process_new_pdfs(folder, filenames, workers=1, use_cache=True, domains=DEFAULT_DOMAINS):
+    records = extract_caseload(folder, workers, use_cache, filenames)
+    output_excel = os.path.join(folder, "iep_goals_summary.xlsx")
+    with CaseloadStore(folder) as store:
+        current, _, superseded = split_superseded(records, store.save(records), store)
+        update_goals_excel(current, output_excel)
+        for domain in domains:
+            if domain != DEFAULT_DOMAIN:
+                update_goals_excel(list(domain_records(current, domain)), domain_path(output_excel, domain))
+        update_goal_index(current, index_path_for(output_excel))
+        generate_docx_files(folder, current + superseded, store=store, domains=domains)
+    return records
+
+def watch_folder(folder, interval=5, workers=1, on_batch=None, should_stop=None, domains=DEFAULT_DOMAINS):
+    sizes = {}
+    while not (should_stop and should_stop()):
+        ready = find_ready_pdfs(folder, sizes)
+        if ready:
+            records = process_new_pdfs(folder, ready, workers, domains=domains)
+            if on_batch:
+                on_batch(records)
+        time.sleep(interval)
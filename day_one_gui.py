@@ -0,0 +1,202 @@
+import time
+import queue
+import threading
+from tkinter import messagebox
+from goal_domains import DEFAULT_DOMAINS
+from run_report import REPORT_FILENAME, RunReport
+from day_one import RunCancelled, find_ready_pdfs, process_day_one, process_new_pdfs
+from caseload_viewer import open_caseload_viewer
+from app_startup import mark_window_shown, startup, warm_up
+
+# ------------------------
+# GUI
+# ------------------------
+# What the Day One window does behind its buttons: the background run, the
+# watch mode and the caseload viewer. Automate_day_one.py and
+# Automate_day_one_visually_appealing.py only lay out their own windows and
+# wire them to these.
+
+# A full run happens on a worker thread so the window stays responsive. The
+# worker never touches tkinter; it posts events to a queue that the main loop
+# drains every POLL_MS.
+POLL_MS = 100
+background_run = {'cancel': None, 'events': None, 'close_when_done': False, 'show_report': False}
+
+def run_day_one_worker(folder, events, cancel, track_memory=False):
+    def progress(stage, done, total, filename):
+        events.put(("progress", stage, done, total, filename))
+
+    run_report = RunReport(track_memory, dict(startup))
+    try:
+        process_day_one(folder, progress=progress, cancel=cancel, run_report=run_report, domains=DAY_ONE_DOMAINS)
+        events.put(("done", run_report.summary_text()))
+    except RunCancelled:
+        events.put(("cancelled", None))
+    except Exception as e:
+        events.put(("error", str(e)))
+
+def start_background_run(root, folder, progress_bar, status_var, on_finish, show_report=False, track_memory=False):
+    events = queue.Queue()
+    cancel = threading.Event()
+    background_run.update(cancel=cancel, events=events, stage=None, close_when_done=False, show_report=show_report)
+    threading.Thread(target=run_day_one_worker, args=(folder, events, cancel, track_memory), daemon=True).start()
+    status_var.set("Starting...")
+    root.after(POLL_MS, poll_background_run, root, progress_bar, status_var, on_finish)
+
+def cancel_background_run(status_var):
+    if background_run['cancel'] is not None:
+        background_run['cancel'].set()
+        status_var.set("Cancelling after the current file...")
+
+def close_window(root, status_var):
+    # Closing mid-run would kill the worker between writing a student's
+    # documents and moving their PDF, so let it stop at a file boundary first.
+    # A watch batch is short and can't be cancelled; it's allowed to finish.
+    if watch_batch['events'] is not None:
+        watch_batch['close_when_done'] = True
+        return
+    if background_run['events'] is None:
+        root.destroy()
+        return
+    background_run['close_when_done'] = True
+    cancel_background_run(status_var)
+
+def folder_busy():
+    # One thing files the folder at a time: a full run or a watch batch
+    if watch_batch['events'] is not None:
+        messagebox.showinfo("Busy", "Filing newly added IEPs; try again in a moment.")
+        return True
+    return False
+
+def poll_background_run(root, progress_bar, status_var, on_finish):
+    events = background_run['events']
+    while True:
+        try:
+            kind, *detail = events.get_nowait()
+        except queue.Empty:
+            break
+
+        if kind == "progress":
+            stage, done, total, filename = detail
+            now = time.perf_counter()
+            if stage != background_run['stage']:
+                # Rate and ETA are per stage, from the first event of that stage
+                background_run.update(stage=stage, started=now, start_done=done)
+            elapsed = now - background_run['started']
+            rate = (done - background_run['start_done']) / elapsed if elapsed > 0 else 0.0
+            eta = f"{(total - done) / rate:.0f}s" if rate else "--"
+            progress_bar.configure(maximum=max(total, 1), value=done)
+            status_var.set(f"{stage} {done}/{total}  |  {rate:.1f} files/sec  |  ETA {eta}")
+            continue
+
+        background_run.update(cancel=None, events=None)
+        on_finish()
+        if background_run['close_when_done']:
+            root.destroy()
+        elif kind == "done":
+            status_var.set("Done")
+            messagebox.showinfo("Success", "Excel and DOCX extraction completed.")
+            if background_run['show_report']:
+                messagebox.showinfo("Run Report", f"{detail[0]}\n\nFull report: {REPORT_FILENAME}")
+        elif kind == "cancelled":
+            status_var.set("Cancelled")
+            messagebox.showinfo("Cancelled", "Run cancelled. Students filed so far keep their folders; run Day One again to file the rest.")
+        else:
+            status_var.set("Error")
+            messagebox.showerror("Error", detail[0])
+        return
+
+    root.after(POLL_MS, poll_background_run, root, progress_bar, status_var, on_finish)
+
+def view_caseload(root, folder):
+    if not folder:
+        messagebox.showwarning("No Folder Selected", "Please select a folder to continue.")
+        return
+    open_caseload_viewer(root, folder)
+
+def window_shown(started):
+    # The window is up; load the heavy libraries while a folder is picked.
+    # started is APP_STARTED from the script that drew it.
+    mark_window_shown(started)
+    if WARM_UP_IMPORTS:
+        warm_up()
+
+WARM_UP_IMPORTS = True
+# Add a domain here (e.g. "Fine Motor") to also get its own workbook and
+# goals document per student; see goal_domains
+DAY_ONE_DOMAINS = DEFAULT_DOMAINS
+
+# Watch mode polls with root.after on the tkinter loop, but only to look for
+# new PDFs; each batch is filed on a worker thread, like a full run, and
+# polled every POLL_MS until it's done
+WATCH_INTERVAL_MS = 5000
+watch_job = None
+watch_batch = {'events': None, 'stop': False, 'close_when_done': False}
+
+def run_watch_batch(folder, filenames, events):
+    try:
+        records = process_new_pdfs(folder, filenames, domains=DAY_ONE_DOMAINS)
+        events.put(("done", len(records)))
+    except Exception as e:
+        events.put(("error", str(e)))
+
+def stop_watching(status_var):
+    global watch_job
+    watch_job = None
+    watch_batch['stop'] = False
+    status_var.set("Not watching")
+
+def poll_watch_folder(root, folder, sizes, status_var):
+    global watch_job
+    events = watch_batch['events']
+    if events is not None:
+        try:
+            kind, detail = events.get_nowait()
+        except queue.Empty:
+            watch_job = root.after(POLL_MS, poll_watch_folder, root, folder, sizes, status_var)
+            return
+        watch_batch['events'] = None
+        if watch_batch['close_when_done']:
+            root.destroy()
+            return
+        if kind == "error":
+            stop_watching(status_var)
+            messagebox.showerror("Error", detail)
+            return
+        status_var.set(f"Filed {detail} new IEP(s) at {time.strftime('%H:%M')}")
+        if watch_batch['stop']:
+            stop_watching(status_var)
+            return
+    else:
+        try:
+            # Leave the folder alone while a full run is filing it
+            ready = [] if background_run['events'] else find_ready_pdfs(folder, sizes)
+        except OSError as e:
+            stop_watching(status_var)
+            messagebox.showerror("Error", str(e))
+            return
+        if ready:
+            events = queue.Queue()
+            watch_batch['events'] = events
+            threading.Thread(target=run_watch_batch, args=(folder, ready, events), daemon=True).start()
+            status_var.set(f"Filing {len(ready)} new IEP(s)...")
+            watch_job = root.after(POLL_MS, poll_watch_folder, root, folder, sizes, status_var)
+            return
+    watch_job = root.after(WATCH_INTERVAL_MS, poll_watch_folder, root, folder, sizes, status_var)
+
+def toggle_watch(root, folder, status_var):
+    global watch_job
+    if watch_job is not None:
+        if watch_batch['events'] is not None:
+            # The batch in flight finishes first; its poll stops watching after
+            watch_batch['stop'] = True
+            status_var.set("Stopping after this batch...")
+            return
+        root.after_cancel(watch_job)
+        stop_watching(status_var)
+        return
+    if not folder:
+        messagebox.showwarning("No Folder Selected", "Please select a folder to continue.")
+        return
+    status_var.set("Watching for new IEPs...")
+    poll_watch_folder(root, folder, {}, status_var)
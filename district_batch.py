@@ -0,0 +1,304 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from day_one import PARSER_VERSION, calibration_parse, extract_student_record
+from extraction_cache import ExtractionCache, file_hash, read_iep_pages
+from iep_duplicates import skip_identical
+from pdf_backends import BACKENDS, select_backend
+from caseload_store import STORE_FILENAME, CaseloadStore, store_path_for
+from goal_domains import DEFAULT_DOMAIN, domain_path, domain_records
+from goals_export import PARQUET_AVAILABLE, new_run_id
+from goals_workbook import write_goals_workbook
+from iep_cli import EXIT_FILE_ERRORS, EXIT_INTERRUPTED, EXIT_OK, emit, run_folder
+
+# ------------------------
+# DISTRICT BATCH
+# ------------------------
+# A district keeps one caseload folder per therapist under a shared root
+# (nested by school is fine). iep_cli.py runs its folders one after another,
+# each with its own pool, so cores sit idle while a small caseload finishes
+# and the pool starts over for the next one. This runs the whole tree through
+# one process pool fed from one job queue:
+#
+#   1. each caseload is planned by a pool job: its PDFs are hashed and
+#      checked against its own extraction cache, and its backend is
+#      calibrated; the PDFs the cache has never seen (identical copies
+#      skipped, as in iter_caseload) are cut into shards of --shard-size
+#   2. shards go on the queue as soon as their caseload is planned, so
+#      planning one caseload overlaps reading another. Results come back to
+#      this process, which is the only writer to each caseload's cache.
+#   3. once a caseload's last shard is in, the caseload itself goes on the
+#      queue and is run through iep_cli's pipeline in a pool process. Every
+#      PDF is a cache hit by then, so that's the store, the workbook and, for
+#      day-one, the documents and filing, same outputs as a single folder.
+#   4. district_goals_summary.xlsx (in the root, or -o DIR) merges every
+#      caseload's current students, with a Caseload column in front
+#
+# stdout is iep_cli's NDJSON, plus one line per shard (its PDFs per second)
+# and one per caseload, then the district summary line.
+#
+#   python district_batch.py day-one DISTRICT_ROOT -w 16
+#
+# A folder counts as a caseload if it holds PDFs or a caseload store; its
+# subfolders are its student folders and aren't searched.
+#
+# A dry run (-n) writes nothing, so there's no cache to hand shard results
+# through; each caseload is then a single job, read without the cache.
+
+DISTRICT_SUMMARY_FILENAME = "district_goals_summary.xlsx"
+SHARD_SIZE = 8
+
+
+def find_caseloads(root):
+    caseloads = []
+    for folder, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        if STORE_FILENAME in files or any(f.lower().endswith(".pdf") for f in files):
+            caseloads.append(folder)
+            dirs[:] = []
+    return caseloads
+
+
+def plan_caseload(folder, backend=None, shard_size=SHARD_SIZE):
+    # In a pool process. Returns ([(backend, [(path, content_hash)])], seconds):
+    # the caseload's shards of PDFs its cache hasn't seen
+    started = time.perf_counter()
+    paths = [os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(".pdf")]
+    paths, hashes, _ = skip_identical(paths, [file_hash(path) for path in paths])
+    with ExtractionCache(folder) as cache:
+        todo = [(path, content_hash) for path, content_hash in zip(paths, hashes) if not cache.contains(content_hash)]
+
+    # Each caseload keeps its own backend choice; see pdf_backends
+    backend = backend or select_backend(folder, [path for path, _ in todo], read_iep_pages, calibration_parse)
+    shards = [(backend, todo[start:start + shard_size]) for start in range(0, len(todo), shard_size)]
+    return shards, time.perf_counter() - started
+
+
+def extract_shard(shard):
+    # In a pool process. A PDF that fails is left out: the caseload run reads
+    # it again on its own and reports the error against the file.
+    backend, files = shard
+    started = time.perf_counter()
+    results = []
+    failed = 0
+    for path, content_hash in files:
+        try:
+            pages, record = extract_student_record(path, backend)
+        except Exception:
+            failed += 1
+            continue
+        results.append((content_hash, pages, record))
+    return results, failed, time.perf_counter() - started, os.getpid()
+
+
+def run_caseload(folder, args):
+    # In a pool process; returns the caseload's counts and how long it took
+    started = time.perf_counter()
+    summary = {'students': 0, 'skipped': 0, 'flagged': 0, 'failed': 0, 'outputs': []}
+    run_folder(folder, args, summary)
+    summary['seconds'] = round(time.perf_counter() - started, 3)
+    return summary
+
+
+def caseload_args(args):
+    # iep_cli's options for one folder: everything was extracted by the
+    # shards, and its outputs stay in the caseload folder
+    return argparse.Namespace(**dict(vars(args), workers=1, output=None, folders=[]))
+
+
+def district_records(root, caseloads):
+    # Every caseload's current students, one store open at a time
+    for folder in caseloads:
+        if not os.path.exists(store_path_for(folder)):
+            continue
+        with CaseloadStore(folder) as store:
+            for record in store.records():
+                record['caseload'] = os.path.relpath(folder, root)
+                yield record
+
+
+def write_district_summary(root, caseloads, output_excel_path, domains):
+    paths = [write_goals_workbook(district_records(root, caseloads), output_excel_path, caseload_column=True)]
+    for domain in domains:
+        if domain != DEFAULT_DOMAIN:
+            paths.append(write_goals_workbook(
+                domain_records(district_records(root, caseloads), domain),
+                domain_path(output_excel_path, domain),
+                caseload_column=True
+            ))
+    return paths
+
+
+def add_counts(summary, counts):
+    for key in ('students', 'skipped', 'flagged', 'failed'):
+        summary[key] += counts[key]
+    summary['outputs'].extend(counts['outputs'])
+
+
+def run_district(root, caseloads, args, summary):
+    started = time.perf_counter()
+    per_caseload = caseload_args(args)
+    pending = {}
+    caches = {}
+    futures = {}
+
+    pool = ProcessPoolExecutor(max_workers=args.workers)
+
+    def queue_caseload(index):
+        futures[pool.submit(run_caseload, caseloads[index], per_caseload)] = ("caseload", index, None, None)
+
+    try:
+        for index, folder in enumerate(caseloads):
+            if args.dry_run:
+                queue_caseload(index)
+            else:
+                futures[pool.submit(plan_caseload, folder, args.pdf_backend, args.shard_size)] = ("plan", index, None, None)
+
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                kind, index, number, shard = futures.pop(future)
+                folder = caseloads[index]
+                if kind == "plan":
+                    try:
+                        shards, seconds = future.result()
+                    except Exception as e:
+                        summary['caseload_errors'] += 1
+                        emit({'type': "caseload", 'status': "error", 'folder': folder, 'error': str(e)})
+                        continue
+                    # Hashing and calibration aren't counted in the shard throughput
+                    summary['plan_seconds'] = round(summary['plan_seconds'] + seconds, 3)
+                    pending[index] = len(shards)
+                    for shard in shards:
+                        summary['shards'] += 1
+                        futures[pool.submit(extract_shard, shard)] = ("shard", index, summary['shards'], shard)
+                    if not shards:
+                        queue_caseload(index)
+                    continue
+
+                if kind == "shard":
+                    results, failed, seconds, worker = future.result()
+                    if index not in caches:
+                        caches[index] = ExtractionCache(folder)
+                    for content_hash, pages, record in results:
+                        caches[index].put(content_hash, PARSER_VERSION, pages, record)
+                    files = len(shard[1])
+                    summary['extracted'] += files
+                    emit({
+                        'type': "shard",
+                        'shard': number,
+                        'folder': folder,
+                        'files': files,
+                        'failed': failed,
+                        'seconds': round(seconds, 3),
+                        'files_per_sec': round(files / seconds, 2) if seconds else 0.0,
+                        'worker': worker,
+                    })
+                    pending[index] -= 1
+                    if pending[index] == 0:
+                        # Committed before the caseload run opens the cache
+                        caches.pop(index).close()
+                        summary['extract_seconds'] = round(time.perf_counter() - started, 3)
+                        queue_caseload(index)
+                    continue
+
+                try:
+                    counts = future.result()
+                except Exception as e:
+                    # One therapist's broken folder shouldn't stop the district
+                    summary['caseload_errors'] += 1
+                    emit({'type': "caseload", 'status': "error", 'folder': folder, 'error': str(e)})
+                    continue
+                add_counts(summary, counts)
+                emit(dict(counts, type="caseload", status="ok", folder=folder))
+    finally:
+        pool.shutdown(cancel_futures=True)
+        for cache in caches.values():
+            cache.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run every caseload folder under a district root at once.")
+    parser.add_argument(
+        "command", choices=["parse", "excel", "day-one"],
+        help="same as iep_cli.py, for every caseload; excel and day-one also write the district summary"
+    )
+    parser.add_argument("root", help="folder holding the caseload folders")
+    parser.add_argument("-o", "--output", help="directory for the district summary workbook (default: the root)")
+    parser.add_argument("-w", "--workers", type=int, default=0, help="processes; 0 uses every core (default: 0)")
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE, help=f"PDFs per job (default: {SHARD_SIZE})")
+    parser.add_argument(
+        "--pdf-backend", choices=sorted(BACKENDS),
+        help="PDF text extractor to use (default: each caseload's own choice, as in iep_cli.py)"
+    )
+    parser.add_argument(
+        "--domain", action="append", default=[], metavar="NAME",
+        help="also extract goals for this domain (any heading starting with NAME); repeatable"
+    )
+    parser.add_argument("-n", "--dry-run", action="store_true", help="extract and report, but write and move nothing")
+    parser.add_argument("--parquet", metavar="DIR", help="also export students/goals/benchmarks tables as Parquet under DIR (needs pyarrow)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.root):
+        parser.error(f"not a folder: {args.root}")
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    if args.shard_size < 1:
+        parser.error("--shard-size must be at least 1")
+    if args.parquet and not PARQUET_AVAILABLE:
+        parser.error("--parquet needs pyarrow (pip install pyarrow)")
+    args.workers = args.workers or None
+    args.run_id = new_run_id()
+    args.domains = [DEFAULT_DOMAIN] + [domain for domain in args.domain if domain != DEFAULT_DOMAIN]
+
+    caseloads = find_caseloads(args.root)
+    summary = {
+        'type': "summary",
+        'command': args.command,
+        'dry_run': args.dry_run,
+        'caseloads': len(caseloads),
+        'caseload_errors': 0,
+        'shards': 0,
+        'plan_seconds': 0.0,
+        'extracted': 0,
+        'extract_seconds': 0.0,
+        'students': 0,
+        'skipped': 0,
+        'flagged': 0,
+        'failed': 0,
+        'outputs': [],
+    }
+    started = time.perf_counter()
+    exit_code = EXIT_OK
+    try:
+        run_district(args.root, caseloads, args, summary)
+        if args.command != "parse" and not args.dry_run and caseloads:
+            output_dir = args.output or args.root
+            os.makedirs(output_dir, exist_ok=True)
+            summary['outputs'].extend(write_district_summary(
+                args.root, caseloads, os.path.join(output_dir, DISTRICT_SUMMARY_FILENAME), args.domains
+            ))
+    except KeyboardInterrupt:
+        summary['interrupted'] = True
+        exit_code = EXIT_INTERRUPTED
+
+    elapsed = time.perf_counter() - started
+    summary['seconds'] = round(elapsed, 3)
+    extract_seconds = summary['extract_seconds']
+    summary['files_per_sec'] = round(summary['extracted'] / extract_seconds, 2) if extract_seconds else 0.0
+    emit(summary)
+
+    if exit_code == EXIT_OK and (summary['failed'] or summary['caseload_errors']):
+        exit_code = EXIT_FILE_ERRORS
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+import io
+import os
+import re
+import zipfile
+from html import escape
+from iep_utils import atomic_output
+
+# ------------------------
+# TEMPLATE-CACHED DOCX RENDERING
+# ------------------------
+# python-docx re-reads its template and recompresses ~800 KB of styles for
+# every Document() it saves, which is most of the time Day One spends per
+# student. A DocxTemplate loads a template once, keeps every part except
+# word/document.xml as an already-compressed zip, and writes each student's
+# document by appending just the body. Paragraphs are serialized the way
+# python-docx serializes add_paragraph/add_heading, so the documents match
+# what Document() + add_* + save() produced.
+#
+# Any .docx can be the template (district letterhead, fonts, headers and
+# footers); generated paragraphs go after whatever its body already holds,
+# as they would with Document(path).
+
+GOALS_TEMPLATE_FILENAME = "goals_template.docx"
+NOTE_TEMPLATE_FILENAME = "note_template.docx"
+DOCUMENT_PART = "word/document.xml"
+
+# Characters XML 1.0 can't hold; lxml refuses them, so python-docx would
+# have raised on them
+INVALID_XML_CHARS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+RUN_BREAKS = re.compile(r"(\t|\r|\n)")
+
+
+def find_template(folder, filename):
+    path = os.path.join(folder, filename) if folder else None
+    return path if path and os.path.exists(path) else None
+
+
+def run_xml(text):
+    # Same translation as python-docx's run.text: tabs become <w:tab/>, line
+    # breaks <w:br/>, and the rest runs of <w:t>
+    parts = []
+    for chunk in RUN_BREAKS.split(INVALID_XML_CHARS.sub("", text)):
+        if chunk == "\t":
+            parts.append("<w:tab/>")
+        elif chunk in ("\r", "\n"):
+            parts.append("<w:br/>")
+        elif chunk:
+            space = ' xml:space="preserve"' if len(chunk.strip()) < len(chunk) else ""
+            parts.append(f"<w:t{space}>{escape(chunk, quote=False)}</w:t>")
+    return f"<w:r>{''.join(parts)}</w:r>"
+
+
+class DocxTemplate:
+    def __init__(self, path=None):
+        # python-docx is only needed here, and is slow to import
+        from docx import Document
+        doc = Document(path)
+        try:
+            self.heading_ids = {level: doc.styles[f"Heading {level}"].style_id for level in (1, 2)}
+        except KeyError:
+            raise ValueError(f"{path} has no Heading 1/Heading 2 styles to build the documents with")
+
+        # Round-trip through python-docx so the static parts are exactly what
+        # Document(path).save() would have written
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        static = io.BytesIO()
+        with zipfile.ZipFile(buffer) as src, zipfile.ZipFile(static, "w", zipfile.ZIP_DEFLATED) as dst:
+            for info in src.infolist():
+                if info.filename == DOCUMENT_PART:
+                    document_xml = src.read(info).decode("utf-8")
+                else:
+                    dst.writestr(info, src.read(info), zipfile.ZIP_DEFLATED)
+        self.static_zip = static.getvalue()
+
+        # New paragraphs go before the body's closing sectPr, like python-docx's
+        body_end = document_xml.rindex("</w:body>")
+        sect_pr = document_xml.rfind("<w:sectPr", 0, body_end)
+        split = sect_pr if sect_pr != -1 else body_end
+        self.head, self.tail = document_xml[:split], document_xml[split:]
+
+    def add_boilerplate(self, paragraphs):
+        # Paragraphs every document from this template starts with, rendered once
+        self.head += "".join(paragraphs)
+
+    def paragraph(self, text=""):
+        return f"<w:p>{run_xml(text)}</w:p>" if text else "<w:p/>"
+
+    def heading(self, text, level=1):
+        style = f'<w:pPr><w:pStyle w:val="{self.heading_ids[level]}"/></w:pPr>'
+        return f"<w:p>{style}{run_xml(text)}</w:p>" if text else f"<w:p>{style}</w:p>"
+
+    def save(self, paragraphs, path):
+        # paragraphs are the XML strings from paragraph()/heading()
+        out = io.BytesIO(self.static_zip)
+        out.seek(0, io.SEEK_END)
+        with zipfile.ZipFile(out, "a", zipfile.ZIP_DEFLATED) as z:
+            z.writestr(DOCUMENT_PART, self.head + "".join(paragraphs) + self.tail)
+        with atomic_output(path) as temp_path:
+            with open(temp_path, "wb") as f:
+                f.write(out.getvalue())
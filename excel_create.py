@@ -1,14 +1,16 @@
 import os
 import re
 import pandas as pd
-from PyPDF2 import PdfReader
+from extraction_cache import ExtractionCache, cached_extract
+from goals_workbook import write_goals_workbook
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
 import os
 import re
 import pandas as pd
-from PyPDF2 import PdfReader
+from extraction_cache import ExtractionCache, cached_extract
+from goals_workbook import write_goals_workbook
 
 def extract_communication_goals(text, student_name=None):
     import re
@@ -67,112 +69,88 @@ def extract_communication_goals(text, student_name=None):
 
     return results
 
-def analyze_pdfs_and_generate_excel(pdf_folder, output_excel_path):
-    all_data = []
-    max_goals = 0
-    max_subgoals_per_goal = {}
-
-    for filename in os.listdir(pdf_folder):
-        if filename.lower().endswith(".pdf"):
-            path = os.path.join(pdf_folder, filename)
-            reader = PdfReader(path)
-            text = "\n".join(page.extract_text() or "" for page in reader.pages)
-
-            student_id = re.search(r"\b(\d{10})\b", text)
-            student_id = student_id.group(1) if student_id else "NoID"
-
-            name_match = re.search(r"Student:\s+([A-Z ,'-]+)", text)
-            name = name_match.group(1).title().replace(",", "").replace("  ", " ") if name_match else "Unknown Student"
-            name_parts = name.split()
-            first_name = name_parts[0] if name_parts else "Unknown"
-            last_name = " ".join(name_parts[1:]) if len(name_parts) > 1 else "Student"
-
-            goals = extract_communication_goals(text, name)
-            max_goals = max(max_goals, len(goals))
-
-            for i, g in enumerate(goals):
-                max_subgoals_per_goal[i] = max(max_subgoals_per_goal.get(i, 0), len(g['subgoals']))
-
-            all_data.append({
-                'first_name': first_name,
-                'last_name': last_name,
-                'id': student_id,
-                'goals': goals
-            })
-
-    columns = ['First Name', 'Last Name', 'Student ID']
-    for g_idx in range(max_goals):
-        columns.append(f'Goal {g_idx+1}')
-        for s_idx in range(max_subgoals_per_goal.get(g_idx, 0)):
-            columns.append(f'Benchmark {g_idx+1}.{s_idx+1}')
+# Bump when the parsing below changes so cached results get re-parsed
+PARSER_VERSION = "excel-create-1"
+SUMMARY_PARSER_VERSION = "excel-summary-1"
 
-    rows = []
-    for student in all_data:
-        row = {
-            'First Name': student['first_name'],
-            'Last Name': student['last_name'],
-            'Student ID': student['id']
-        }
-        for g_idx in range(max_goals):
-            if g_idx < len(student['goals']):
-                goal = student['goals'][g_idx]
-                row[f'Goal {g_idx+1}'] = goal['goal']
-                for s_idx in range(max_subgoals_per_goal[g_idx]):
-                    key = f'Benchmark {g_idx+1}.{s_idx+1}'
-                    if s_idx < len(goal['subgoals']):
-                        row[key] = goal['subgoals'][s_idx]
-                    else:
-                        row[key] = ''
-            else:
-                row[f'Goal {g_idx+1}'] = ''
-                for s_idx in range(max_subgoals_per_goal[g_idx]):
-                    row[f'Benchmark {g_idx+1}.{s_idx+1}'] = ''
-        rows.append(row)
+def parse_student_text(text):
+    student_id = re.search(r"\b(\d{10})\b", text)
+    student_id = student_id.group(1) if student_id else "NoID"
+
+    name_match = re.search(r"Student:\s+([A-Z ,'-]+)", text)
+    name = name_match.group(1).title().replace(",", "").replace("  ", " ") if name_match else "Unknown Student"
+    name_parts = name.split()
+    first_name = name_parts[0] if name_parts else "Unknown"
+    last_name = " ".join(name_parts[1:]) if len(name_parts) > 1 else "Student"
 
-    df = pd.DataFrame(rows, columns=columns)
-    df.to_excel(output_excel_path, index=False)
-    return output_excel_path
+    return {
+        'first_name': first_name,
+        'last_name': last_name,
+        'id': student_id,
+        'goals': extract_communication_goals(text, name)
+    }
+
+def analyze_pdfs_and_generate_excel(pdf_folder, output_excel_path):
+    # Students are streamed into the workbook as they're extracted
+    with ExtractionCache(pdf_folder) as cache:
+        students = (
+            cached_extract(cache, os.path.join(pdf_folder, filename), PARSER_VERSION, parse_student_text)
+            for filename in os.listdir(pdf_folder)
+            if filename.lower().endswith(".pdf")
+        )
+        return write_goals_workbook(students, output_excel_path)
+
+def parse_student_summary(text):
+    # Extract student ID
+    id_match = re.search(r"\b(\d{10})\b", text)
+    student_id = id_match.group(1) if id_match else "NoID"
+
+    # Extract name using improved logic
+    name = extract_name(text)
+    name_parts = name.split()
+    first_name = name_parts[0] if name_parts else "Unknown"
+    last_name = " ".join(name_parts[1:]) if len(name_parts) > 1 else "Student"
+
+    return {
+        'first_name': first_name,
+        'last_name': last_name,
+        'id': student_id,
+        'goals': extract_communication_goals(text, name)
+    }
 
 def process_pdfs_to_excel(folder_path):
     rows = []
-    for filename in os.listdir(folder_path):
-        if filename.lower().endswith(".pdf"):
-            pdf_path = os.path.join(folder_path, filename)
-            reader = PdfReader(pdf_path)
-            text = "\n".join(page.extract_text() or "" for page in reader.pages)
-
-            # Extract student ID
-            id_match = re.search(r"\b(\d{10})\b", text)
-            student_id = id_match.group(1) if id_match else "NoID"
-
-            # Extract name using improved logic
-            name = extract_name(text)
-            name_parts = name.split()
-            first_name = name_parts[0] if name_parts else "Unknown"
-            last_name = " ".join(name_parts[1:]) if len(name_parts) > 1 else "Student"
-
-            goals_data = extract_communication_goals(text, name)
-
-            row = {
-                "First Name": first_name,
-                "Last Name": last_name,
-                "Student ID": student_id
-            }
-
-            for i in range(2):
-                if i < len(goals_data):
-                    row[f"Goal {i+1}"] = goals_data[i]['goal']
-                    for j in range(3):
-                        if j < len(goals_data[i]['subgoals']):
-                            row[f"Benchmark {i+1}.{j+1}"] = goals_data[i]['subgoals'][j]
-                        else:
+    with ExtractionCache(folder_path) as cache:
+        for filename in os.listdir(folder_path):
+            if filename.lower().endswith(".pdf"):
+                pdf_path = os.path.join(folder_path, filename)
+                student = cached_extract(cache, pdf_path, SUMMARY_PARSER_VERSION, parse_student_summary)
+
+                first_name = student['first_name']
+                last_name = student['last_name']
+                student_id = student['id']
+                goals_data = student['goals']
+
+                row = {
+                    "First Name": first_name,
+                    "Last Name": last_name,
+                    "Student ID": student_id
+                }
+
+                for i in range(2):
+                    if i < len(goals_data):
+                        row[f"Goal {i+1}"] = goals_data[i]['goal']
+                        for j in range(3):
+                            if j < len(goals_data[i]['subgoals']):
+                                row[f"Benchmark {i+1}.{j+1}"] = goals_data[i]['subgoals'][j]
+                            else:
+                                row[f"Benchmark {i+1}.{j+1}"] = ""
+                    else:
+                        row[f"Goal {i+1}"] = ""
+                        for j in range(3):
                             row[f"Benchmark {i+1}.{j+1}"] = ""
-                else:
-                    row[f"Goal {i+1}"] = ""
-                    for j in range(3):
-                        row[f"Benchmark {i+1}.{j+1}"] = ""
 
-            rows.append(row)
+                rows.append(row)
 
     df = pd.DataFrame(rows)
     excel_path = os.path.join(folder_path, "iep_goals_summary.xlsx")
@@ -213,15 +191,16 @@ def extract_name(text):
     return "Unknown Student"
 
 
-# Create GUI window
-root = tk.Tk()
-root.title("IEP Goal Extractor")
+if __name__ == "__main__":
+    # Create GUI window
+    root = tk.Tk()
+    root.title("IEP Goal Extractor")
 
-folder_var = tk.StringVar()
+    folder_var = tk.StringVar()
 
-tk.Label(root, text="Selected Folder:").pack()
-tk.Entry(root, textvariable=folder_var, width=60).pack(padx=10)
-tk.Button(root, text="Select Folder", command=select_folder).pack(pady=5)
-tk.Button(root, text="Run Extraction", command=run_extraction).pack(pady=5)
+    tk.Label(root, text="Selected Folder:").pack()
+    tk.Entry(root, textvariable=folder_var, width=60).pack(padx=10)
+    tk.Button(root, text="Select Folder", command=select_folder).pack(pady=5)
+    tk.Button(root, text="Run Extraction", command=run_extraction).pack(pady=5)
 
-root.mainloop()
+    root.mainloop()
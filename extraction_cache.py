@@ -0,0 +1,179 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+from pdf_backends import DEFAULT_BACKEND, open_pdf
+from iep_document import STUDENT_ID_LABEL, TEN_DIGIT_ID
+
+# ------------------------
+# PDF TEXT EXTRACTION CACHE
+# ------------------------
+# Lives in the caseload folder. Rows are keyed by the SHA-256 of the PDF bytes,
+# so a PDF that was renamed or moved into a student folder is still a hit.
+# Parsed results are also keyed by the parser version of the script that made
+# them; bumping a script's PARSER_VERSION re-parses from the cached page text
+# without reading the PDF again.
+
+CACHE_FILENAME = ".iep_extraction_cache.sqlite"
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    content_hash TEXT PRIMARY KEY,
+    pages TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS parsed (
+    content_hash TEXT NOT NULL,
+    parser_version TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (content_hash, parser_version)
+);
+CREATE INDEX IF NOT EXISTS documents_last_used ON documents (last_used);
+"""
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Markers the lazy reader watches for. The goal parsers only look at the
+# student header, the ID and the Communication sections, which sit near the
+# front of the IEP; everything after the Assessments/Accommodations pages is
+# never parsed, so there's no point extracting it. The two ID patterns are
+# iep_document's, so the reader waits for exactly what the parser reads.
+STUDENT_HEADER = re.compile(r"Student:\s+\S")
+COMM_HEADER = re.compile(r"Domain\(s\)/TSAA\(s\):\s*Communication", re.IGNORECASE)
+GOALS_END = re.compile(r"\n(?:Assessments|Accommodations)", re.IGNORECASE)
+PAGE_OVERLAP = 200
+
+
+def read_iep_pages(path, backend=DEFAULT_BACKEND):
+    # Extracts pages in order and stops once the header, both ID forms and a
+    # closed Communication section have been seen. Pages that were never read
+    # are None, so the list also records which pages were actually used. If
+    # any marker is missing the whole document is read, same as before.
+    page_count, texts = open_pdf(path, backend)
+    pages = [None] * page_count
+    seen = set()
+    goals_closed = False
+    tail = ""
+
+    for number, text in enumerate(texts):
+        pages[number] = text
+
+        # Carry the end of the previous page so markers split by a page break still match
+        window = tail + "\n" + text
+        tail = text[-PAGE_OVERLAP:]
+        for name, pattern in (("header", STUDENT_HEADER), ("label", STUDENT_ID_LABEL), ("id", TEN_DIGIT_ID)):
+            if name not in seen and pattern.search(window):
+                seen.add(name)
+
+        start = 0
+        for header in COMM_HEADER.finditer(window):
+            seen.add("communication")
+            goals_closed = False
+            start = header.end()
+        if "communication" in seen and not goals_closed:
+            goals_closed = GOALS_END.search(window, start) is not None
+
+        if goals_closed and len(seen) == 4:
+            break
+
+    return pages
+
+
+def join_pages(pages):
+    return "\n".join(page for page in pages if page is not None)
+
+
+class ExtractionCache:
+    def __init__(self, folder, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(os.path.join(folder, CACHE_FILENAME), timeout=30)
+        self.conn.executescript(SCHEMA)
+
+    def contains(self, content_hash):
+        return self.conn.execute(
+            "SELECT 1 FROM documents WHERE content_hash = ?", (content_hash,)
+        ).fetchone() is not None
+
+    def get(self, content_hash, parser_version):
+        # Returns (pages, parsed); pages is None on a miss, parsed is None when
+        # the text is cached but this parser version hasn't seen it yet
+        row = self.conn.execute(
+            "SELECT pages FROM documents WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        if row is None:
+            return None, None
+
+        self.conn.execute(
+            "UPDATE documents SET last_used = ? WHERE content_hash = ?",
+            (time.time(), content_hash)
+        )
+        parsed = self.conn.execute(
+            "SELECT result FROM parsed WHERE content_hash = ? AND parser_version = ?",
+            (content_hash, parser_version)
+        ).fetchone()
+        return json.loads(row[0]), json.loads(parsed[0]) if parsed else None
+
+    def put(self, content_hash, parser_version, pages, parsed):
+        pages_json = json.dumps(pages)
+        parsed_json = json.dumps(parsed)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO documents (content_hash, pages, size, last_used) VALUES (?, ?, ?, ?)",
+            (content_hash, pages_json, len(pages_json) + len(parsed_json), time.time())
+        )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO parsed (content_hash, parser_version, result) VALUES (?, ?, ?)",
+            (content_hash, parser_version, parsed_json)
+        )
+
+    def evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM documents").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        stale = []
+        for content_hash, size in self.conn.execute(
+            "SELECT content_hash, size FROM documents ORDER BY last_used"
+        ):
+            if total <= self.max_bytes:
+                break
+            stale.append((content_hash,))
+            total -= size
+
+        self.conn.executemany("DELETE FROM documents WHERE content_hash = ?", stale)
+        self.conn.executemany("DELETE FROM parsed WHERE content_hash = ?", stale)
+
+    def close(self):
+        self.evict()
+        self.conn.commit()
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def cached_extract(cache, path, parser_version, parse):
+    # parse() takes the joined page text and must return something JSON-serializable
+    content_hash = file_hash(path)
+    pages, parsed = cache.get(content_hash, parser_version)
+    if parsed is not None:
+        return parsed
+
+    if pages is None:
+        pages = read_iep_pages(path)
+    parsed = parse(join_pages(pages))
+    cache.put(content_hash, parser_version, pages, parsed)
+    return parsed
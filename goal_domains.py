@@ -0,0 +1,65 @@
+import os
+import re
+
+# ------------------------
+# GOAL DOMAINS
+# ------------------------
+# Every IEP is parsed for the goals under every "Domain(s)/TSAA(s):" heading,
+# not just Communication, and the record keeps them by domain:
+#
+#   record['goals']     Communication, as always
+#   record['domains']   {domain: goals} for every domain in the IEP
+#
+# so related-services staff read the same cached extraction as speech. A
+# heading that starts with one of the TSAA domains below is filed under that
+# domain; anything else under the heading's own text, up to its first goal.
+#
+# Outputs are partitioned per domain: Communication keeps the names it always
+# had, and any other selected domain gets its own summary workbook and goals
+# document, named with the domain (iep_goals_summary_fine_motor.xlsx,
+# goals_fine_motor.docx), for just the students who have goals in it.
+
+DEFAULT_DOMAIN = "Communication"
+DEFAULT_DOMAINS = [DEFAULT_DOMAIN]
+KNOWN_DOMAINS = [
+    "Communication",
+    "Curriculum and Learning",
+    "Social or Emotional Behavior",
+    "Independent Functioning",
+    "Health Care",
+]
+NOT_SLUG = re.compile(r"[^a-z0-9]+")
+
+
+def domain_slug(domain):
+    return NOT_SLUG.sub("_", domain.lower()).strip("_")
+
+
+def domain_path(path, domain):
+    # path for Communication, otherwise with the domain before the extension
+    if domain == DEFAULT_DOMAIN:
+        return path
+    base, ext = os.path.splitext(path)
+    return f"{base}_{domain_slug(domain)}{ext}"
+
+
+def goals_for(record, domain):
+    # A domain matches every heading that starts with it, in document order
+    if domain == DEFAULT_DOMAIN:
+        return record['goals']
+    prefix = domain.lower()
+    return [
+        goal
+        for name, goals in (record.get('domains') or {}).items()
+        if name.lower().startswith(prefix)
+        for goal in goals
+    ]
+
+
+def domain_records(records, domain):
+    # The records again with goals for domain; for any domain but
+    # Communication, students without goals in it are left out
+    for record in records:
+        goals = goals_for(record, domain)
+        if goals or domain == DEFAULT_DOMAIN:
+            yield dict(record, goals=goals)
@@ -0,0 +1,185 @@
+import os
+import re
+import json
+from bisect import bisect_left
+from iep_utils import atomic_output, student_key
+
+# ------------------------
+# GOAL SEARCH INDEX
+# ------------------------
+# An inverted index over the caseload: every word of a student's name, ID,
+# goals and benchmarks points at that student. It is saved as
+# iep_goals_index.json next to iep_goals_summary.xlsx and updated in place
+# as students are added or re-filed, so "who has an articulation /r/ goal"
+# doesn't mean opening the workbook.
+#
+# Every query word is matched as a prefix, so "artic /r" finds articulation
+# /r/ goals while it's still being typed, and all words have to match.
+# Sound targets like /r/ and /th/ are kept as single words.
+
+INDEX_FILENAME = "iep_goals_index.json"
+WORKBOOK_FILENAME = "iep_goals_summary.xlsx"
+INDEX_VERSION = 1
+WORD = re.compile(r"/[a-z]+/?|[a-z0-9]+(?:'[a-z]+)?")
+
+
+def words(text):
+    return WORD.findall(text.lower())
+
+
+def student_words(student):
+    found = set(words(f"{student['first_name']} {student['last_name']} {student['id']}"))
+    for goal in student['goals']:
+        found.update(words(goal['goal']))
+        for subgoal in goal['subgoals']:
+            found.update(words(subgoal))
+    return found
+
+
+def index_path_for(excel_path):
+    # Keeps the workbook's caseload prefix, if the CLI gave it one
+    folder, name = os.path.split(excel_path)
+    prefix = name[:-len(WORKBOOK_FILENAME)] if name.endswith(WORKBOOK_FILENAME) else ""
+    return os.path.join(folder, prefix + INDEX_FILENAME)
+
+
+class GoalIndex:
+    def __init__(self):
+        self.students = {}
+        self.postings = {}
+        self.student_words = {}
+        self.vocabulary = []
+        self.vocabulary_stale = False
+        self.order = []
+        self.order_stale = False
+
+    def __len__(self):
+        return len(self.students)
+
+    def add(self, student):
+        # Adding a student that's already indexed replaces their old goals
+        key = student_key(student)
+        self.remove(key)
+        self.students[key] = {
+            'first_name': student['first_name'],
+            'last_name': student['last_name'],
+            'id': student['id'],
+            'filename': student.get('filename'),
+            'goals': student['goals'],
+        }
+        self.order_stale = True
+        found = student_words(student)
+        self.student_words[key] = found
+        for word in found:
+            keys = self.postings.get(word)
+            if keys is None:
+                self.postings[word] = {key}
+                self.vocabulary_stale = True
+            else:
+                keys.add(key)
+        return key
+
+    def update(self, records):
+        for student in records:
+            self.add(student)
+
+    def remove(self, key):
+        if self.students.pop(key, None) is None:
+            return
+        self.order_stale = True
+        for word in self.student_words.pop(key, ()):
+            keys = self.postings[word]
+            keys.discard(key)
+            if not keys:
+                del self.postings[word]
+                self.vocabulary_stale = True
+
+    def student(self, key):
+        return self.students.get(key)
+
+    def matching(self, prefix):
+        # Students with any word starting with prefix; a sorted vocabulary
+        # turns that into one bisect and a short walk
+        if self.vocabulary_stale:
+            self.vocabulary = sorted(self.postings)
+            self.vocabulary_stale = False
+        found = set()
+        for i in range(bisect_left(self.vocabulary, prefix), len(self.vocabulary)):
+            word = self.vocabulary[i]
+            if not word.startswith(prefix):
+                break
+            found |= self.postings[word]
+        return found
+
+    def sort_key(self, key):
+        student = self.students[key]
+        return (student['last_name'].lower(), student['first_name'].lower(), key)
+
+    def sorted_keys(self):
+        # The whole caseload by last then first name, sorted once per change
+        if self.order_stale:
+            self.order = sorted(self.students, key=self.sort_key)
+            self.order_stale = False
+        return self.order
+
+    def search(self, query, limit=None):
+        # Returns student keys, sorted by last then first name. An empty query
+        # lists the whole caseload.
+        order = self.sorted_keys()
+        query_words = words(query)
+        if not query_words:
+            keys = list(order)
+        else:
+            # Rarest word first, so the running intersection stays small
+            matches = sorted((self.matching(word) for word in query_words), key=len)
+            found = matches[0]
+            for other in matches[1:]:
+                if not found:
+                    break
+                found = found & other
+            # Picking a big match out of the caseload order beats sorting it
+            if len(found) * 8 > len(order):
+                keys = [key for key in order if key in found]
+            else:
+                keys = sorted(found, key=self.sort_key)
+        return keys[:limit] if limit is not None else keys
+
+    def save(self, path):
+        data = {
+            'version': INDEX_VERSION,
+            'students': self.students,
+            'postings': {word: sorted(keys) for word, keys in self.postings.items()},
+        }
+        # A crash mid-save leaves the previous index rather than half of this one
+        with atomic_output(path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        # A missing or out-of-date index loads as empty; the caller rebuilds it
+        index = cls()
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+        if data.get('version') != INDEX_VERSION:
+            return index
+
+        index.students = data['students']
+        for word, keys in data['postings'].items():
+            index.postings[word] = set(keys)
+            for key in keys:
+                index.student_words.setdefault(key, set()).add(word)
+        index.vocabulary_stale = True
+        index.order_stale = True
+        return index
+
+
+def update_goal_index(records, path):
+    # Loads the saved index, adds or replaces these students and saves it again
+    index = GoalIndex.load(path)
+    index.update(records)
+    return index.save(path)
@@ -0,0 +1,146 @@
+import os
+import time
+import uuid
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+PARQUET_AVAILABLE = pq is not None
+
+# ------------------------
+# LONG-FORMAT PARQUET EXPORT
+# ------------------------
+# The same goals as iep_goals_summary.xlsx, as three tidy tables for the
+# analytics side: one row per student, per goal and per benchmark, keyed by
+# student ID and 1-based goal/benchmark index (Goal 2 / Benchmark 2.3 in the
+# workbook is goal_index 2, benchmark_index 3).
+#
+#   EXPORT_DIR/students/run=20250901T081500/part-<caseload>-<random>.parquet
+#   EXPORT_DIR/goals/run=.../...
+#   EXPORT_DIR/benchmarks/run=.../...
+#
+# Every run gets its own partition and every caseload its own file, so runs
+# and schools only ever add files. pd.read_parquet(EXPORT_DIR + "/goals")
+# reads all of them back with run as a column. pyarrow is optional; only
+# this export needs it.
+
+BATCH_STUDENTS = 1000
+
+SCHEMAS = {}
+if pa is not None:
+    SCHEMAS = {
+        'students': pa.schema([
+            ('caseload', pa.string()),
+            ('student_id', pa.string()),
+            ('first_name', pa.string()),
+            ('last_name', pa.string()),
+            ('filename', pa.string()),
+            ('goal_count', pa.int32()),
+        ]),
+        'goals': pa.schema([
+            ('caseload', pa.string()),
+            ('student_id', pa.string()),
+            ('goal_index', pa.int32()),
+            ('goal', pa.string()),
+            ('benchmark_count', pa.int32()),
+        ]),
+        'benchmarks': pa.schema([
+            ('caseload', pa.string()),
+            ('student_id', pa.string()),
+            ('goal_index', pa.int32()),
+            ('benchmark_index', pa.int32()),
+            ('benchmark', pa.string()),
+        ]),
+    }
+
+
+def new_run_id():
+    return time.strftime("%Y%m%dT%H%M%S")
+
+
+def safe_part_name(caseload):
+    name = "".join(c if c.isalnum() or c in "-_" else "_" for c in caseload)
+    return f"part-{name}-{uuid.uuid4().hex[:8]}.parquet"
+
+
+def empty_columns():
+    return {table: {field: [] for field in schema.names} for table, schema in SCHEMAS.items()}
+
+
+def add_student(columns, student, caseload):
+    student_id = student['id']
+    goals = student['goals']
+    row = columns['students']
+    row['caseload'].append(caseload)
+    row['student_id'].append(student_id)
+    row['first_name'].append(student['first_name'])
+    row['last_name'].append(student['last_name'])
+    row['filename'].append(student.get('filename'))
+    row['goal_count'].append(len(goals))
+
+    for g_idx, goal in enumerate(goals, 1):
+        row = columns['goals']
+        row['caseload'].append(caseload)
+        row['student_id'].append(student_id)
+        row['goal_index'].append(g_idx)
+        row['goal'].append(goal['goal'])
+        row['benchmark_count'].append(len(goal['subgoals']))
+
+        for s_idx, subgoal in enumerate(goal['subgoals'], 1):
+            row = columns['benchmarks']
+            row['caseload'].append(caseload)
+            row['student_id'].append(student_id)
+            row['goal_index'].append(g_idx)
+            row['benchmark_index'].append(s_idx)
+            row['benchmark'].append(subgoal)
+
+
+def write_goals_parquet(records, export_dir, caseload, run_id=None):
+    # records can be any iterable; students are flushed BATCH_STUDENTS at a
+    # time as row groups, so a district export doesn't sit in memory.
+    # Returns the paths written, one per table.
+    if pq is None:
+        raise ImportError("The Parquet export needs pyarrow (pip install pyarrow).")
+    run_id = run_id or new_run_id()
+
+    # Parts are written under a dot name, which readers skip, and renamed
+    # into place once complete, so a failed run never leaves half a table
+    part_name = safe_part_name(caseload)
+    paths = {}
+    writers = {}
+    for table, schema in SCHEMAS.items():
+        folder = os.path.join(export_dir, table, f"run={run_id}")
+        os.makedirs(folder, exist_ok=True)
+        paths[table] = os.path.join(folder, part_name)
+        writers[table] = pq.ParquetWriter(os.path.join(folder, "." + part_name), schema)
+
+    def flush(columns):
+        for table, writer in writers.items():
+            writer.write_table(pa.table(columns[table], schema=SCHEMAS[table]))
+
+    complete = False
+    try:
+        columns = empty_columns()
+        pending = 0
+        for student in records:
+            add_student(columns, student, caseload)
+            pending += 1
+            if pending == BATCH_STUDENTS:
+                flush(columns)
+                columns = empty_columns()
+                pending = 0
+        if pending:
+            flush(columns)
+        complete = True
+    finally:
+        for table, writer in writers.items():
+            writer.close()
+            hidden = os.path.join(os.path.dirname(paths[table]), "." + part_name)
+            if complete:
+                os.replace(hidden, paths[table])
+            else:
+                os.remove(hidden)
+    return [paths[table] for table in SCHEMAS]
@@ -0,0 +1,122 @@
+import json
+import tempfile
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+from iep_utils import atomic_output
+
+# ------------------------
+# STREAMING GOALS WORKBOOK
+# ------------------------
+# Writes iep_goals_summary.xlsx without holding the caseload in memory. The
+# Goal N / Benchmark N.M columns depend on the largest goal and benchmark
+# counts in the whole caseload, which aren't known until the last student.
+# So students are spooled to a temporary file as they arrive, one JSON line
+# each, while the column layout is tracked; the workbook is then streamed
+# from the spool with openpyxl's write-only mode. Memory stays at one student
+# plus the layout, however big the caseload.
+#
+# The sheet matches what pandas to_excel(index=False) wrote before: same
+# sheet name, columns and empty strings for missing goals, with the bold
+# boxed header pandas 1.x and 2.x put on it. The district-wide summary adds
+# a Caseload column in front (caseload_column=True), read from record['caseload'].
+
+SHEET_NAME = "Sheet1"
+THIN = Side(style="thin")
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=THIN, right=THIN, top=THIN, bottom=THIN)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+
+def goal_columns(max_goals, max_subgoals_per_goal, caseload_column=False):
+    columns = (['Caseload'] if caseload_column else []) + ['First Name', 'Last Name', 'Student ID']
+    for g_idx in range(max_goals):
+        columns.append(f'Goal {g_idx+1}')
+        for s_idx in range(max_subgoals_per_goal.get(g_idx, 0)):
+            columns.append(f'Benchmark {g_idx+1}.{s_idx+1}')
+    return columns
+
+
+def spool_records(records, spool, caseload_column=False):
+    # Writes each record to spool and returns the column layout
+    max_goals = 0
+    max_subgoals_per_goal = {}
+    for student in records:
+        goals = student['goals']
+        max_goals = max(max_goals, len(goals))
+        for i, g in enumerate(goals):
+            max_subgoals_per_goal[i] = max(max_subgoals_per_goal.get(i, 0), len(g['subgoals']))
+        line = [
+            student['first_name'], student['last_name'], student['id'],
+            [[g['goal'], g['subgoals']] for g in goals]
+        ]
+        if caseload_column:
+            line.insert(0, student['caseload'])
+        spool.write(json.dumps(line) + "\n")
+    return max_goals, max_subgoals_per_goal
+
+
+def goal_row(student, max_goals, max_subgoals_per_goal):
+    *caseload, first_name, last_name, student_id, goals = student
+    row = caseload + [first_name, last_name, student_id]
+    for g_idx in range(max_goals):
+        goal, subgoals = goals[g_idx] if g_idx < len(goals) else ('', [])
+        row.append(goal)
+        for s_idx in range(max_subgoals_per_goal.get(g_idx, 0)):
+            row.append(subgoals[s_idx] if s_idx < len(subgoals) else '')
+    return row
+
+
+def header_row(ws, columns):
+    cells = []
+    for name in columns:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.font = HEADER_FONT
+        cell.border = HEADER_BORDER
+        cell.alignment = HEADER_ALIGNMENT
+        cells.append(cell)
+    return cells
+
+
+def write_goals_workbook(records, output_excel_path, caseload_column=False):
+    # records can be any iterable, including a generator that is still extracting
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as spool:
+        max_goals, max_subgoals_per_goal = spool_records(records, spool, caseload_column)
+        spool.seek(0)
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(SHEET_NAME)
+        ws.append(header_row(ws, goal_columns(max_goals, max_subgoals_per_goal, caseload_column)))
+        for line in spool:
+            ws.append(goal_row(json.loads(line), max_goals, max_subgoals_per_goal))
+        with atomic_output(output_excel_path) as temp_path:
+            wb.save(temp_path)
+    return output_excel_path
+
+
+def read_goals_workbook(path):
+    # Yields the workbook's students back as records, for folders whose goals
+    # are only in the summary; Goal/Benchmark cells left empty are skipped
+    wb = load_workbook(path, read_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(name) if name is not None else "" for name in next(rows, ())]
+        for row in rows:
+            values = dict(zip(header, row))
+            goals = []
+            for name in header:
+                value = values[name]
+                if value in (None, ""):
+                    continue
+                if name.startswith("Goal "):
+                    goals.append({'goal': str(value), 'subgoals': []})
+                elif name.startswith("Benchmark ") and goals:
+                    goals[-1]['subgoals'].append(str(value))
+            yield {
+                'first_name': str(values.get('First Name') or ""),
+                'last_name': str(values.get('Last Name') or ""),
+                'id': str(values.get('Student ID') or "NoID"),
+                'goals': goals,
+            }
+    finally:
+        wb.close()
@@ -0,0 +1,299 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+from day_one import (
+    build_name_lookup,
+    extract_caseload,
+    generate_docx_files,
+    start_or_resume,
+    student_folder_name,
+    watch_folder,
+    write_domain_workbooks,
+    write_goals_excel,
+)
+from goals_export import PARQUET_AVAILABLE, new_run_id, write_goals_parquet
+from pdf_backends import BACKENDS
+from goal_index import index_path_for, update_goal_index
+from caseload_store import CaseloadStore
+from iep_duplicates import drop_superseded, split_superseded
+from goal_domains import DEFAULT_DOMAIN, domain_path, goals_for
+from job_journal import JobJournal
+
+# ------------------------
+# HEADLESS BATCH ENTRY POINT
+# ------------------------
+# Same pipeline as the Day One GUI, for cron jobs and servers with no display.
+# Every student is written to stdout as one JSON object per line, followed by
+# a summary line; anything meant for a person goes to stderr.
+#
+#   python iep_cli.py parse   FOLDER [FOLDER ...]   goals as NDJSON, writes nothing
+#   python iep_cli.py excel   FOLDER [FOLDER ...]   + caseload store, iep_goals_summary.xlsx and its search index
+#   python iep_cli.py day-one FOLDER [FOLDER ...]   + goals/note DOCX, PDFs filed
+#   python iep_cli.py watch   FOLDER                day-one for each PDF dropped in, until Ctrl-C
+#
+# --parquet DIR adds the long-format goal tables from goals_export to excel
+# and day-one runs; all folders in one invocation share a run partition.
+# An interrupted day-one run is finished by the next one, like the GUI's.
+# --domain NAME (repeatable) adds that domain's goals: to each parse line, and
+# as its own workbook and goals document (see goal_domains).
+
+EXIT_OK = 0
+EXIT_FILE_ERRORS = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+
+def emit(obj):
+    sys.stdout.write(json.dumps(obj) + "\n")
+    sys.stdout.flush()
+
+
+def extract_folder(folder, workers, backend=None, filenames=None, use_cache=True):
+    # Returns (records, failures). One unreadable PDF shouldn't sink a nightly
+    # run, so on failure retry file by file; whatever was already extracted is
+    # in the cache, so only the rest is read again. A dry run passes
+    # use_cache=False, which writes nothing to the folder.
+    try:
+        return extract_caseload(folder, workers, use_cache, filenames=filenames, backend=backend), []
+    except Exception:
+        pass
+
+    if filenames is None:
+        filenames = [f for f in os.listdir(folder) if f.lower().endswith(".pdf")]
+    records, failures = [], []
+    for filename in filenames:
+        try:
+            records.extend(extract_caseload(folder, 1, use_cache, filenames=[filename], backend=backend))
+        except Exception as e:
+            failures.append({'filename': filename, 'error': str(e)})
+    return drop_superseded(records), failures
+
+
+def caseload_name(folder):
+    return os.path.basename(os.path.normpath(os.path.abspath(folder)))
+
+
+def excel_path_for(folder, args):
+    if not args.output:
+        return os.path.join(folder, "iep_goals_summary.xlsx")
+    os.makedirs(args.output, exist_ok=True)
+    if len(args.folders) == 1:
+        return os.path.join(args.output, "iep_goals_summary.xlsx")
+    return os.path.join(args.output, f"{caseload_name(folder)}_iep_goals_summary.xlsx")
+
+
+def emit_results(folder, args, records, failures, name_lookup, superseded=()):
+    for student in records:
+        result = {
+            'type': "student",
+            'status': "ok",
+            'folder': folder,
+            'file': student['filename'],
+            'first_name': student['first_name'],
+            'last_name': student['last_name'],
+            'id': student['id'],
+            'goal_count': len(student['goals']),
+            'benchmark_count': sum(len(g['subgoals']) for g in student['goals']),
+            'pages_used': student['pages_used'],
+        }
+        if student.get('parse_warnings'):
+            result['warnings'] = student['parse_warnings']
+        if args.command == "parse":
+            result['goals'] = student['goals']
+            if args.domain:
+                result['domains'] = {domain: goals_for(student, domain) for domain in args.domain}
+        if args.command in ("day-one", "watch"):
+            result['student_folder'] = student_folder_name(student, name_lookup)[1]
+        emit(result)
+
+    for student in superseded:
+        # Older than the IEP an earlier run filed for this student
+        emit({
+            'type': "student",
+            'status': "skipped",
+            'folder': folder,
+            'file': student['filename'],
+            'reason': "superseded",
+            'kept': student['superseded_by'],
+        })
+
+    for student in list(records) + list(superseded):
+        kept = student.get('superseded_by', student['filename'])
+        for duplicate in student['duplicates']:
+            emit({
+                'type': "student",
+                'status': "skipped",
+                'folder': folder,
+                'file': duplicate['filename'],
+                'reason': duplicate['reason'],
+                'kept': kept,
+            })
+
+    for failure in failures:
+        emit({
+            'type': "student",
+            'status': "error",
+            'folder': folder,
+            'file': failure['filename'],
+            'error': failure['error'],
+        })
+
+
+def run_folder(folder, args, summary):
+    failures = []
+
+    def extract(filenames):
+        records, failed = extract_folder(folder, args.workers, args.pdf_backend, filenames, not args.dry_run)
+        failures.extend(failed)
+        return records
+
+    if args.dry_run or args.command == "parse":
+        records = extract(None)
+        summary['students'] += len(records)
+        summary['skipped'] += sum(len(student['duplicates']) for student in records)
+        summary['flagged'] += sum(1 for student in records if student.get('parse_warnings'))
+        summary['failed'] += len(failures)
+        # Nothing is saved, so folder names come from this run alone
+        emit_results(folder, args, records, failures, build_name_lookup(records))
+        return
+
+    with CaseloadStore(folder) as store:
+        journal = JobJournal(folder) if args.command == "day-one" else None
+        try:
+            if journal:
+                records, document_ids = start_or_resume(folder, store, journal, extract)
+            else:
+                records = extract(None)
+                document_ids = store.save(records)
+            records, document_ids, superseded = split_superseded(records, document_ids, store)
+            summary['students'] += len(records)
+            summary['skipped'] += len(superseded) + sum(len(student['duplicates']) for student in records + superseded)
+            summary['flagged'] += sum(1 for student in records if student.get('parse_warnings'))
+            summary['failed'] += len(failures)
+            emit_results(folder, args, records, failures, store.names(), superseded)
+            if records:
+                excel_path = write_goals_excel(store.records(document_ids), excel_path_for(folder, args))
+                summary['outputs'].append(excel_path)
+                write_domain_workbooks(records, excel_path, args.domains)
+                summary['outputs'].extend(domain_path(excel_path, domain) for domain in args.domains if domain != DEFAULT_DOMAIN)
+                summary['outputs'].append(update_goal_index(records, index_path_for(excel_path)))
+            if args.parquet:
+                summary['outputs'].extend(write_goals_parquet(records, args.parquet, caseload_name(folder), args.run_id))
+            if journal:
+                # PDFs that failed to parse stay where they are for the next run
+                generate_docx_files(folder, records + superseded, store=store, journal=journal, domains=args.domains)
+                for filename in journal.missing():
+                    emit({
+                        'type': "student",
+                        'status': "missing",
+                        'folder': folder,
+                        'file': filename,
+                        'error': "gone from the folder when filing resumed",
+                    })
+                journal.finish()
+        finally:
+            if journal:
+                journal.close()
+
+
+def watch(folder, args, summary):
+    # Files PDFs as they're dropped into the folder, as the GUI's watch mode
+    # does, with a line for each student in every batch
+    def on_batch(records):
+        current = [student for student in records if not student.get('superseded_by')]
+        superseded = [student for student in records if student.get('superseded_by')]
+        summary['students'] += len(current)
+        summary['skipped'] += len(superseded) + sum(len(student['duplicates']) for student in records)
+        summary['flagged'] += sum(1 for student in current if student.get('parse_warnings'))
+        with CaseloadStore(folder) as store:
+            emit_results(folder, args, current, [], store.names(), superseded)
+
+    watch_folder(folder, args.interval, args.workers, on_batch, domains=args.domains)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Extract IEP goals without the GUI.")
+    parser.add_argument(
+        "command", choices=["parse", "excel", "day-one", "watch"],
+        help="parse: goals only; excel: also write the summary workbook; "
+             "day-one: also write DOCX files and file each PDF; "
+             "watch: day-one for each PDF added to one folder, until interrupted"
+    )
+    parser.add_argument("folders", nargs="+", help="caseload folder(s) of IEP PDFs")
+    parser.add_argument("-o", "--output", help="directory for the summary workbook (default: each caseload folder)")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="extraction processes; 0 uses every core (default: 1)")
+    parser.add_argument(
+        "--pdf-backend", choices=sorted(BACKENDS),
+        help="PDF text extractor to use (default: the fastest installed one that reads this caseload the same as pypdf2)"
+    )
+    parser.add_argument(
+        "--domain", action="append", default=[], metavar="NAME",
+        help="also extract goals for this domain (any heading starting with NAME); repeatable"
+    )
+    parser.add_argument("-n", "--dry-run", action="store_true", help="extract and report, but write and move nothing")
+    parser.add_argument("--parquet", metavar="DIR", help="also export students/goals/benchmarks tables as Parquet under DIR (needs pyarrow)")
+    parser.add_argument("--interval", type=float, default=5, help="watch: seconds between looks at the folder (default: 5)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    for folder in args.folders:
+        if not os.path.isdir(folder):
+            parser.error(f"not a folder: {folder}")
+    if args.workers < 0:
+        parser.error("--workers must be 0 or more")
+    if args.parquet and not PARQUET_AVAILABLE:
+        parser.error("--parquet needs pyarrow (pip install pyarrow)")
+    if args.command == "watch":
+        if len(args.folders) != 1:
+            parser.error("watch takes one folder")
+        if args.output or args.dry_run or args.parquet:
+            parser.error("watch files into the folder itself; --output, --dry-run and --parquet don't apply")
+        if args.interval <= 0:
+            parser.error("--interval must be more than 0")
+    args.workers = args.workers or None
+    args.run_id = new_run_id()
+    args.domains = [DEFAULT_DOMAIN] + [domain for domain in args.domain if domain != DEFAULT_DOMAIN]
+
+    summary = {
+        'type': "summary",
+        'command': args.command,
+        'dry_run': args.dry_run,
+        'folders': len(args.folders),
+        'students': 0,
+        'skipped': 0,
+        'flagged': 0,
+        'failed': 0,
+        'outputs': [],
+    }
+    started = time.perf_counter()
+    exit_code = EXIT_OK
+    try:
+        if args.command == "watch":
+            watch(args.folders[0], args, summary)
+        else:
+            for folder in args.folders:
+                run_folder(folder, args, summary)
+    except KeyboardInterrupt:
+        # Ctrl-C is how watch is meant to stop
+        if args.command != "watch":
+            summary['interrupted'] = True
+            exit_code = EXIT_INTERRUPTED
+
+    elapsed = time.perf_counter() - started
+    summary['seconds'] = round(elapsed, 3)
+    summary['files_per_sec'] = round((summary['students'] + summary['failed']) / elapsed, 2) if elapsed else 0.0
+    emit(summary)
+
+    if exit_code == EXIT_OK and summary['failed']:
+        exit_code = EXIT_FILE_ERRORS
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
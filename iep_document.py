@@ -0,0 +1,118 @@
+import re
+from bisect import bisect_right
+
+# ------------------------
+# PARSED IEP DOCUMENT
+# ------------------------
+# One IEP's text, page by page, with a section index built the first time
+# something asks for it. The name and ID only ever appear in the student
+# header, which is everything before the first domain (or the Assessments /
+# Accommodations pages); looking for the 10-digit ID there, instead of the
+# whole document, keeps a phone number or case number further in from being
+# taken for it. The goal parsers start from the indexed domain headers
+# instead of searching the text again.
+#
+# text is the same "\n"-joined page text join_pages makes, so offsets into
+# it can be used with anything that parsed the joined text before.
+
+SECTION_HEADER = re.compile(
+    r"Domain\(s\)/TSAA\(s\):\s*(?P<domain>(?:(?!Domain\(s\)/TSAA\(s\):)[^\n])*)"
+    r"|^(?P<other>Assessments|Accommodations)\b",
+    re.IGNORECASE | re.MULTILINE
+)
+STUDENT_NAME = re.compile(r"Student:\s+([A-Z\s'-]+),\s*([A-Z][a-zA-Z'-]+)")
+NAME_FALLBACK = re.compile(r"\b([A-Z][a-z]+)\s+will\b")
+TEN_DIGIT_ID = re.compile(r"\b(\d{10})\b")
+STUDENT_ID_LABEL = re.compile(r"Student ID:\s*(\d+)")
+MEETING_DATE = re.compile(r"(?:Meeting Date|Date of Meeting):\s*(\d{1,2})/(\d{1,2})/(\d{4}|\d{2})\b", re.IGNORECASE)
+
+
+class IEPDocument:
+    def __init__(self, pages):
+        # pages as read_iep_pages returns them; None for pages never read
+        self.pages = pages
+        self.page_numbers = []
+        self.page_starts = []
+        parts = []
+        offset = 0
+        for number, page in enumerate(pages):
+            if page is None:
+                continue
+            self.page_numbers.append(number)
+            self.page_starts.append(offset)
+            parts.append(page)
+            offset += len(page) + 1
+        self.text = "\n".join(parts)
+        self._sections = None
+
+    @classmethod
+    def from_text(cls, text):
+        return cls([text])
+
+    @property
+    def pages_used(self):
+        return list(self.page_numbers)
+
+    def page_at(self, offset):
+        # Index into pages of the page holding text[offset]
+        return self.page_numbers[bisect_right(self.page_starts, offset) - 1]
+
+    @property
+    def sections(self):
+        # [{'kind', 'name', 'start', 'name_start', 'page'}], in document order.
+        # kind is "domain", "assessments" or "accommodations"; start is where
+        # the heading begins and name_start where its domain name does.
+        if self._sections is None:
+            self._sections = []
+            for match in SECTION_HEADER.finditer(self.text):
+                if match.group('domain') is not None:
+                    kind, name, name_start = "domain", match.group('domain').strip(), match.start('domain')
+                else:
+                    kind = name = match.group('other').lower()
+                    name_start = match.start()
+                self._sections.append({
+                    'kind': kind,
+                    'name': name,
+                    'start': match.start(),
+                    'name_start': name_start,
+                    'page': self.page_at(match.start()),
+                })
+        return self._sections
+
+    @property
+    def header_end(self):
+        return self.sections[0]['start'] if self.sections else len(self.text)
+
+    @property
+    def header(self):
+        return self.text[:self.header_end]
+
+    def student_id(self):
+        match = TEN_DIGIT_ID.search(self.text, 0, self.header_end)
+        return match.group(1) if match else "NoID"
+
+    def header_id(self):
+        match = STUDENT_ID_LABEL.search(self.text, 0, self.header_end)
+        return match.group(1) if match else None
+
+    def meeting_date(self):
+        # "YYYY-MM-DD", or None when the header doesn't give one
+        match = MEETING_DATE.search(self.text, 0, self.header_end)
+        if not match:
+            return None
+        month, day, year = match.groups()
+        if len(year) == 2:
+            year = "20" + year
+        return f"{year}-{int(month):02d}-{int(day):02d}"
+
+    def student_name(self):
+        # (first, last); falls back to the first "<Name> will" in the goals
+        match = STUDENT_NAME.search(self.text, 0, self.header_end)
+        if match:
+            return match.group(2).strip().title(), match.group(1).strip().title()
+
+        fallback = NAME_FALLBACK.search(self.text)
+        if fallback:
+            return fallback.group(1), "Student"
+
+        return "Unknown", "Student"
@@ -0,0 +1,106 @@
+import os
+from iep_utils import student_key
+
+# ------------------------
+# DUPLICATE AND SUPERSEDED IEPS
+# ------------------------
+# A caseload folder often holds the same PDF exported twice, or a student's
+# annual IEP next to one or more amendments. Only one IEP per student should
+# reach the workbook and get documents written:
+#
+#   identical   byte for byte the same file as another PDF (same content
+#               hash); skipped before any text is extracted
+#   superseded  the same student as an IEP with a later meeting date; both
+#               are read, since the ID and the date are inside the PDF
+#
+# Nothing skipped is lost. Each skipped PDF is listed in the record that
+# replaced it, as record['duplicates'] = [{'filename', 'reason'}], and Day One
+# files it into that student's folder along with the current one. Between two
+# IEPs with the same meeting date, or none, the later one in the folder wins,
+# which is whose documents used to end up in the student's folder anyway. A
+# dated IEP always wins over one without a date.
+#
+# drop_superseded only sees one run. An IEP older than one filed by an
+# earlier run is saved to the caseload store without becoming current there;
+# split_superseded, after the save, takes it out of the run's outputs and
+# marks it record['superseded_by'] so Day One files it without writing any
+# documents from it.
+
+
+def skip_identical(paths, hashes):
+    # Returns (paths, hashes, {filename read: [duplicates]}) where only the
+    # first of each set of identical PDFs is left to be read
+    first = {}
+    kept_paths, kept_hashes = [], []
+    duplicates = {}
+    for path, content_hash in zip(paths, hashes):
+        if content_hash in first:
+            duplicates.setdefault(first[content_hash], []).append(
+                {'filename': os.path.basename(path), 'reason': "identical"}
+            )
+            continue
+        first[content_hash] = os.path.basename(path)
+        kept_paths.append(path)
+        kept_hashes.append(content_hash)
+    return kept_paths, kept_hashes, duplicates
+
+
+def meeting_order(record):
+    # ISO dates compare as strings; no date sorts first
+    return record.get('meeting_date') or ""
+
+
+def supersede(winner, loser, reason):
+    # The loser's own duplicates go with it
+    winner.setdefault('duplicates', [])
+    winner['duplicates'].append({'filename': loser['filename'], 'reason': reason})
+    winner['duplicates'].extend(loser.pop('duplicates', []))
+
+
+def drop_superseded(records, run_report=None):
+    # Keeps each student's most recent IEP, in the order students first
+    # appear, and reports everything skipped along the way. Identical PDFs
+    # that were read anyway (the CLI's file-by-file retry) are caught here too.
+    current = {}
+    by_hash = {}
+    for record in records:
+        record.setdefault('duplicates', [])
+        content_hash = record.get('content_hash')
+        if content_hash and content_hash in by_hash:
+            supersede(current[by_hash[content_hash]], record, "identical")
+            continue
+        key = student_key(record)
+        if content_hash:
+            by_hash[content_hash] = key
+        if key not in current:
+            current[key] = record
+        elif meeting_order(current[key]) > meeting_order(record):
+            supersede(current[key], record, "superseded")
+        else:
+            supersede(record, current[key], "superseded")
+            current[key] = record
+
+    if run_report:
+        for record in current.values():
+            for duplicate in record['duplicates']:
+                run_report.skip(duplicate['filename'], duplicate['reason'], record['filename'])
+    return list(current.values())
+
+
+def split_superseded(records, document_ids, store, run_report=None):
+    # Returns (records, document_ids) still current in the store, and the
+    # records that aren't, each marked with the filename that kept its place
+    current_ids = set(store.current_documents(document_ids))
+    kept, kept_ids, superseded = [], [], []
+    for record, document_id in zip(records, document_ids):
+        if document_id in current_ids:
+            kept.append(record)
+            kept_ids.append(document_id)
+            continue
+        record['superseded_by'] = store.record(store.current_document(record))['filename']
+        superseded.append(record)
+        if run_report:
+            run_report.skip(record['filename'], "superseded", record['superseded_by'])
+            for duplicate in record.get('duplicates', []):
+                run_report.skip(duplicate['filename'], duplicate['reason'], record['superseded_by'])
+    return kept, kept_ids, superseded
@@ -0,0 +1,28 @@
+import os
+from contextlib import contextmanager
+
+# ------------------------
+# SHARED HELPERS
+# ------------------------
+# Small pieces more than one module needs, kept here so none of them has to
+# import another module just for a helper.
+
+
+def student_key(student):
+    # Students are the same student across runs by ID; without one, by PDF
+    if student['id'] and student['id'] != "NoID":
+        return student['id']
+    return f"file:{student.get('filename')}"
+
+
+@contextmanager
+def atomic_output(path):
+    # Yields a temporary path beside path and swaps it in once written, so a
+    # crash never leaves a half-written file under the real name
+    temp_path = path + ".tmp"
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,126 @@
+import os
+import json
+import time
+
+# ------------------------
+# DAY ONE JOB JOURNAL
+# ------------------------
+# Filing a caseload means, per student: make the folder, write goals.docx and
+# note.docx, move the PDF in. A run that dies partway used to leave some
+# students filed and the rest not, and the next run only saw the PDFs still
+# at the top level, so its workbook was missing everyone filed before the
+# crash.
+#
+# The journal is an append-only log in the caseload folder. A run starts by
+# writing down every student it will file (by PDF and caseload store
+# document), then logs each step as it's done. The move is logged, with its
+# target, before it happens, so a crash mid-move is recognised on resume.
+# An unfinished journal means the next run picks up the same students from the
+# store without reading their PDFs again, skips whatever was already filed,
+# and writes the workbook for the whole run. A finished run removes the log.
+#
+#   {"event": "start", "students": [{"filename": ..., "document_id": ..., "duplicates": [...]}], ...}
+#   {"event": "step", "filename": ..., "step": "docs"}
+#   {"event": "step", "filename": ..., "step": "moving", "target": ...}
+#   {"event": "step", "filename": ..., "step": "moved"}
+#   {"event": "step", "filename": ..., "step": "missing"}
+#
+# "missing" is a PDF that was gone from the folder, and not at its target,
+# when a resumed run came to file it (deleted by hand since the interruption).
+# It's reported and skipped rather than failing every later run.
+
+JOURNAL_FILENAME = ".iep_day_one_journal.jsonl"
+
+
+def journal_pending(folder):
+    # True while a Day One run in folder is interrupted and not yet finished
+    return os.path.exists(os.path.join(folder, JOURNAL_FILENAME))
+
+
+class JobJournal:
+    def __init__(self, folder):
+        self.path = os.path.join(folder, JOURNAL_FILENAME)
+        self.students = []
+        self.steps = {}
+        self.file = None
+        self.replay()
+
+    def replay(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError:
+            return
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # A crash while appending leaves at most one torn line, at the end
+                break
+            if entry['event'] in ("start", "add"):
+                self.students.extend(entry['students'])
+            elif entry['event'] == "step":
+                self.steps.setdefault(entry['filename'], {})[entry['step']] = entry
+
+    def unfinished(self):
+        return bool(self.students)
+
+    def filenames(self):
+        # Every PDF in the run, including those skipped as duplicates
+        return [
+            filename
+            for student in self.students
+            for filename in [student['filename']] + [d['filename'] for d in student.get('duplicates', [])]
+        ]
+
+    def duplicates(self):
+        return [student.get('duplicates', []) for student in self.students]
+
+    def document_ids(self):
+        return [student['document_id'] for student in self.students]
+
+    def append(self, entry, sync=False):
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.file.write(json.dumps(entry) + "\n")
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+
+    def start(self, records, document_ids, event="start"):
+        students = [
+            {'filename': student['filename'], 'document_id': document_id, 'duplicates': student.get('duplicates', [])}
+            for student, document_id in zip(records, document_ids)
+        ]
+        self.students.extend(students)
+        self.append({'event': event, 'time': time.time(), 'students': students}, sync=True)
+
+    def add(self, records, document_ids):
+        # New PDFs that turned up before an unfinished run was resumed
+        self.start(records, document_ids, event="add")
+
+    def step(self, filename, step, sync=False, **detail):
+        entry = {'event': "step", 'filename': filename, 'step': step, **detail}
+        self.steps.setdefault(filename, {})[step] = entry
+        self.append(entry, sync)
+
+    def done(self, filename, step):
+        return step in self.steps.get(filename, {})
+
+    def missing(self):
+        return [filename for filename, steps in self.steps.items() if "missing" in steps]
+
+    def detail(self, filename, step):
+        return self.steps.get(filename, {}).get(step)
+
+    def finish(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.students = []
+        self.steps = {}
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
@@ -0,0 +1,81 @@
+import time
+
+# ------------------------
+# PARSE GUARD
+# ------------------------
+# A malformed PDF can come back from extract_text() as one enormous line, or
+# as megabytes of text with no section headers at all. The goal parser is a
+# single forward pass, but its per-line work grows with the line, so one such
+# document shouldn't be allowed to hold up the rest of the caseload.
+#
+# Before parsing, shape_warnings() looks for what real IEPs never have:
+# lines longer than MAX_LINE_CHARS or more than MAX_DOCUMENT_CHARS of text.
+# Those documents are parsed from bounded_pages() instead, which breaks long
+# lines at a space and stops at the size limit. Every document is also
+# parsed against a CPU budget (Deadline); one that runs out keeps its name
+# and ID but no goals. Either way the record says why in 'parse_warnings',
+# and the run goes on to the next PDF.
+
+MAX_LINE_CHARS = 20_000
+MAX_DOCUMENT_CHARS = 2_000_000
+PARSE_BUDGET_SECONDS = 5.0
+
+
+class ParseBudgetExceeded(Exception):
+    pass
+
+
+class Deadline:
+    # CPU time of the calling thread, so a GUI worker thread or a pool
+    # process is only charged for its own document
+    def __init__(self, seconds=PARSE_BUDGET_SECONDS):
+        self.seconds = seconds
+        self.expires = time.thread_time() + seconds
+
+    def check(self):
+        if time.thread_time() > self.expires:
+            raise ParseBudgetExceeded()
+
+
+def shape_warnings(pages):
+    warnings = []
+    text_pages = [page for page in pages if page is not None]
+    total = sum(len(page) for page in text_pages)
+    if total > MAX_DOCUMENT_CHARS:
+        warnings.append(f"{total:,} characters of text; only the first {MAX_DOCUMENT_CHARS:,} were read")
+    longest = max((len(line) for page in text_pages for line in page.split("\n")), default=0)
+    if longest > MAX_LINE_CHARS:
+        warnings.append(f"a {longest:,}-character line; long lines were split")
+    return warnings
+
+
+def split_line(line):
+    # Pieces of at most MAX_LINE_CHARS, broken at the last space where there is one
+    pieces = []
+    start = 0
+    while len(line) - start > MAX_LINE_CHARS:
+        cut = line.rfind(" ", start + 1, start + MAX_LINE_CHARS)
+        if cut == -1:
+            cut = start + MAX_LINE_CHARS
+        pieces.append(line[start:cut])
+        start = cut + 1 if line[cut] == " " else cut
+    pieces.append(line[start:])
+    return pieces
+
+
+def bounded_pages(pages):
+    # pages with long lines split and the text cut off at MAX_DOCUMENT_CHARS;
+    # pages past the limit become None, like pages that were never read
+    bounded = []
+    remaining = MAX_DOCUMENT_CHARS
+    for page in pages:
+        if page is None or remaining <= 0:
+            bounded.append(None)
+            continue
+        page = page[:remaining]
+        remaining -= len(page)
+        lines = []
+        for line in page.split("\n"):
+            lines.extend(split_line(line) if len(line) > MAX_LINE_CHARS else [line])
+        bounded.append("\n".join(lines))
+    return bounded
@@ -0,0 +1,173 @@
+import os
+import re
+import json
+import time
+from importlib.util import find_spec
+
+# ------------------------
+# PDF TEXT BACKENDS
+# ------------------------
+# PyPDF2 is what every script was written against and stays the default.
+# Any other extractor that happens to be installed (pypdf, PyMuPDF,
+# pdfminer.six) can stand in for it. calibrate() times each one on a sample
+# of the caseload's own PDFs and only keeps a faster backend when its text
+# parses to exactly the same records as PyPDF2's and has the same characters.
+# The second check is what catches a backend that reads an apostrophe as a
+# curly quote: it's in every IEP's boilerplate, but only in the odd name.
+# The choice is saved in the caseload folder, so the timing runs once per
+# caseload rather than per run.
+#
+# A backend is a function open(path) -> (page_count, page texts), where the
+# texts are yielded in order and only extracted as they're asked for, so
+# read_iep_pages can still stop at the last goal page. Each extractor is only
+# imported the first time a PDF is opened with it; they take seconds to load
+# and the GUI shouldn't wait on them to open.
+
+DEFAULT_BACKEND = "pypdf2"
+CHOICE_FILENAME = ".iep_pdf_backend.json"
+CALIBRATION_SAMPLE = 5
+WHITESPACE = re.compile(r"\s+")
+
+
+def open_pypdf2(path):
+    from PyPDF2 import PdfReader
+    reader = PdfReader(path)
+    return len(reader.pages), (page.extract_text() or "" for page in reader.pages)
+
+
+def open_pypdf(path):
+    from pypdf import PdfReader
+    reader = PdfReader(path)
+    return len(reader.pages), (page.extract_text() or "" for page in reader.pages)
+
+
+def open_pymupdf(path):
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf
+    doc = pymupdf.open(path)
+
+    def texts():
+        try:
+            for page in doc:
+                yield page.get_text()
+        finally:
+            doc.close()
+    return doc.page_count, texts()
+
+
+def open_pdfminer(path):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+    from pdfminer.pdfpage import PDFPage
+    with open(path, "rb") as f:
+        page_count = sum(1 for _ in PDFPage.get_pages(f))
+    texts = (
+        "".join(element.get_text() for element in page if isinstance(element, LTTextContainer))
+        for page in extract_pages(path)
+    )
+    return page_count, texts
+
+
+BACKENDS = {DEFAULT_BACKEND: open_pypdf2}
+if find_spec("pypdf"):
+    BACKENDS["pypdf"] = open_pypdf
+if find_spec("pymupdf") or find_spec("fitz"):
+    BACKENDS["pymupdf"] = open_pymupdf
+if find_spec("pdfminer"):
+    BACKENDS["pdfminer"] = open_pdfminer
+
+
+def register_backend(name, open_pdf):
+    BACKENDS[name] = open_pdf
+
+
+def open_pdf(path, backend=DEFAULT_BACKEND):
+    return BACKENDS[backend or DEFAULT_BACKEND](path)
+
+
+def calibration_sample(paths, sample_size=CALIBRATION_SAMPLE):
+    # Spread across the caseload rather than the first few files
+    step = max(1, len(paths) // sample_size)
+    return paths[::step][:sample_size]
+
+
+def same_characters(pages, expected):
+    # Layout whitespace may differ; anything else may not
+    if len(pages) != len(expected):
+        return False
+    for page, other in zip(pages, expected):
+        if (page is None) != (other is None):
+            return False
+        if page is not None and WHITESPACE.sub("", page) != WHITESPACE.sub("", other):
+            return False
+    return True
+
+
+def calibrate(paths, read_pages, parse, sample_size=CALIBRATION_SAMPLE):
+    # Returns (fastest matching backend, {backend: seconds or None}).
+    # read_pages(path, backend) reads the way the pipeline does; parse(pages)
+    # must give equal results for equal goals. None means the backend failed
+    # or read something PyPDF2 didn't.
+    sample = calibration_sample(paths, sample_size)
+    expected_pages = [read_pages(path, DEFAULT_BACKEND) for path in sample]
+    expected = [parse(pages) for pages in expected_pages]
+    timings = {}
+    for name in BACKENDS:
+        started = time.perf_counter()
+        try:
+            pages = [read_pages(path, name) for path in sample]
+        except Exception:
+            timings[name] = None
+            continue
+        seconds = time.perf_counter() - started
+        matched = name == DEFAULT_BACKEND or all(
+            same_characters(p, ep) and parse(p) == e for p, ep, e in zip(pages, expected_pages, expected)
+        )
+        timings[name] = seconds if matched else None
+
+    best = min(
+        (name for name, seconds in timings.items() if seconds is not None),
+        key=lambda name: timings[name]
+    )
+    return best, timings
+
+
+def load_choice(folder):
+    try:
+        with open(os.path.join(folder, CHOICE_FILENAME)) as f:
+            choice = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return choice if choice.get('backend') in BACKENDS else None
+
+
+def select_backend(folder, paths, read_pages, parse, save=True):
+    # The saved choice for this caseload, or a fresh calibration. Installing
+    # a new extractor means it hasn't been timed yet, so that re-calibrates too.
+    # Until there are enough new PDFs for a full sample, and if calibrating
+    # fails (an unreadable PDF), PyPDF2 is used and nothing is saved. With
+    # save=False (a dry run) a fresh choice is used but not written down.
+    if len(BACKENDS) == 1:
+        return DEFAULT_BACKEND
+    choice = load_choice(folder)
+    if choice and set(choice['timings']) == set(BACKENDS):
+        return choice['backend']
+    if len(paths) < CALIBRATION_SAMPLE:
+        return DEFAULT_BACKEND
+
+    try:
+        best, timings = calibrate(paths, read_pages, parse)
+    except Exception:
+        return DEFAULT_BACKEND
+    if not save:
+        return best
+    with open(os.path.join(folder, CHOICE_FILENAME), "w") as f:
+        json.dump({
+            'backend': best,
+            'timings': timings,
+            'sample': [os.path.basename(path) for path in calibration_sample(paths)],
+            'calibrated': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }, f, indent=2)
+    return best
@@ -0,0 +1,368 @@
+import os
+import re
+import sys
+import zipfile
+import argparse
+import datetime
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+from day_one import clean_action
+from caseload_store import CaseloadStore
+from iep_utils import atomic_output
+from session_notes import SESSION_NOTES_DIRNAME
+
+# ------------------------
+# PROGRESS DATA
+# ------------------------
+# Once the "[ subgoal N percentage accuracy ]" placeholders in the notes are
+# filled in, the notes are the caseload's progress data. ingest_progress()
+# reads every note in the student folders (note.docx, the dated notes from
+# session_notes, and its combined day documents) straight from their XML, and
+# keeps one observation per filled-in benchmark line as flat NumPy arrays:
+#
+#   student    int32    index into student_ids
+#   goal       int16    1-based, as in the workbook
+#   benchmark  int16    1-based
+#   day        datetime64[D]
+#   accuracy   float32  percent
+#
+# saved to iep_progress.npz in the caseload folder. A line is matched to its
+# benchmark by the action text create_note_doc wrote for it, in order, so
+# editing the rest of the note is fine. The session date is the note's
+# "Date:" line, the date in its filename, or failing both the day the file
+# was last saved.
+#
+# benchmark_trends() then works on the whole caseload at once, with no loop
+# over students: observations are sorted by (student, goal, benchmark, day)
+# and every per-benchmark figure is a segment sum over that order.
+#
+#   trend      least-squares slope, in percentage points per week
+#   rolling    mean of the last ROLLING_WINDOW sessions
+#   at_risk    rolling + trend projected to the IEP's end date (a year after
+#              its meeting, or RISK_HORIZON_WEEKS out) falls short of the
+#              benchmark's own "N%" target, or DEFAULT_TARGET
+
+PROGRESS_FILENAME = "iep_progress.npz"
+SUMMARY_FILENAME = "iep_progress_summary.xlsx"
+ROLLING_WINDOW = 3
+MIN_SESSIONS = 3
+DEFAULT_TARGET = 80.0
+RISK_HORIZON_WEEKS = 12
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+NOTE_LINE = re.compile(r"\bachieved\s+(.+?)\s+accuracy in being able to\s+(.+?)\.?\s*$", re.IGNORECASE)
+PERCENT = re.compile(r"^(\d{1,3}(?:\.\d+)?)\s*%?$")
+FRACTION = re.compile(r"^(\d+)\s*(?:/|of|out of)\s*(\d+)$", re.IGNORECASE)
+NOTE_DATE = re.compile(r"^Date:\s*(\d{1,2})/(\d{1,2})/(\d{4})\s*$")
+FILENAME_DATE = re.compile(r"(\d{4})-(\d{2})-(\d{2})\.docx$")
+FOLDER_ID = re.compile(r"_(\d+)$")
+DAY_NOTE_STUDENT = re.compile(r"^.+ \((\d+)\)$")
+TARGET = re.compile(r"(\d{1,3})\s*%")
+
+
+def docx_paragraphs(path):
+    # Paragraph texts from word/document.xml; Word is free to split a
+    # paragraph into as many runs as it likes
+    with zipfile.ZipFile(path) as z:
+        root = ET.fromstring(z.read("word/document.xml"))
+    paragraphs = []
+    for p in root.iter(W + "p"):
+        parts = []
+        for node in p.iter():
+            if node.tag == W + "t":
+                parts.append(node.text or "")
+            elif node.tag == W + "tab":
+                parts.append("\t")
+        paragraphs.append("".join(parts).strip())
+    return paragraphs
+
+
+def parse_accuracy(text):
+    # "80%", "80", "8/10", "8 of 10"; None for a placeholder left as is
+    text = text.strip()
+    match = PERCENT.match(text)
+    if match:
+        value = float(match.group(1))
+        return value if value <= 100 else None
+    match = FRACTION.match(text)
+    if match and int(match.group(2)):
+        return 100.0 * int(match.group(1)) / int(match.group(2))
+    return None
+
+
+def note_date(path, paragraphs):
+    for text in paragraphs:
+        match = NOTE_DATE.match(text)
+        if match:
+            month, day, year = map(int, match.groups())
+            return datetime.date(year, month, day)
+    match = FILENAME_DATE.search(os.path.basename(path))
+    if match:
+        return datetime.date(*map(int, match.groups()))
+    return datetime.date.fromtimestamp(os.path.getmtime(path))
+
+
+def normalize_action(action):
+    return " ".join(action.lower().split()).rstrip(".")
+
+
+def note_benchmarks(record):
+    # [(goal, benchmark, action)] in the order create_note_doc wrote them
+    expected = []
+    for g_idx, goal in enumerate(record['goals'], 1):
+        for s_idx, subgoal in enumerate(goal['subgoals'], 1):
+            action = clean_action(subgoal)
+            if action:
+                expected.append((g_idx, s_idx, normalize_action(action)))
+    return expected
+
+
+def match_lines(expected, lines):
+    # Yields (goal, benchmark, accuracy) for the filled-in lines. Each line
+    # takes the next benchmark with its action, so two benchmarks with the
+    # same wording are still told apart by order.
+    pointer = 0
+    for value, action in lines:
+        action = normalize_action(action)
+        found = next((i for i in range(pointer, len(expected)) if expected[i][2] == action), None)
+        if found is None:
+            found = next((i for i in range(len(expected)) if expected[i][2] == action), None)
+        if found is None:
+            continue
+        pointer = found + 1
+        accuracy = parse_accuracy(value)
+        if accuracy is not None:
+            yield expected[found][0], expected[found][1], accuracy
+
+
+def note_lines(paragraphs):
+    lines = []
+    for text in paragraphs:
+        match = NOTE_LINE.search(text)
+        if match:
+            lines.append(match.groups())
+    return lines
+
+
+def student_folders(folder):
+    # (student ID, folder path) for each Day One student folder
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        match = FOLDER_ID.search(name)
+        if match and os.path.isdir(path):
+            yield match.group(1), path
+
+
+def ingest_progress(folder):
+    # Returns the progress arrays (see above) plus student_ids and
+    # meeting_dates, one per student index
+    observations = []
+    student_ids, meeting_dates, expected = [], [], {}
+    with CaseloadStore(folder) as store:
+        def student_index(student_id):
+            if student_id not in expected:
+                record = store.current_record(student_id)
+                if record is None:
+                    return None
+                expected[student_id] = (len(student_ids), note_benchmarks(record))
+                student_ids.append(student_id)
+                meeting_dates.append(record.get('meeting_date') or "")
+            return expected[student_id][0]
+
+        for student_id, path in student_folders(folder):
+            if student_index(student_id) is None:
+                continue
+            for filename in sorted(os.listdir(path)):
+                if not (filename.startswith("note") and filename.endswith(".docx")):
+                    continue
+                note_path = os.path.join(path, filename)
+                paragraphs = docx_paragraphs(note_path)
+                day = note_date(note_path, paragraphs)
+                index, benchmarks = expected[student_id]
+                for goal, benchmark, accuracy in match_lines(benchmarks, note_lines(paragraphs)):
+                    observations.append((index, goal, benchmark, day, accuracy))
+
+        # session_notes --combined: a student's lines follow their "Name (ID)"
+        day_folder = os.path.join(folder, SESSION_NOTES_DIRNAME)
+        for filename in sorted(os.listdir(day_folder)) if os.path.isdir(day_folder) else []:
+            if not filename.endswith(".docx"):
+                continue
+            note_path = os.path.join(day_folder, filename)
+            paragraphs = docx_paragraphs(note_path)
+            day = note_date(note_path, [])
+            student_id, chunk = None, []
+            for text in paragraphs + [None]:
+                heading = DAY_NOTE_STUDENT.match(text) if text is not None else None
+                if text is None or heading:
+                    if student_id is not None and student_index(student_id) is not None:
+                        index, benchmarks = expected[student_id]
+                        for goal, benchmark, accuracy in match_lines(benchmarks, note_lines(chunk)):
+                            observations.append((index, goal, benchmark, day, accuracy))
+                    student_id, chunk = heading.group(1) if heading else None, []
+                else:
+                    chunk.append(text)
+
+    columns = list(zip(*observations)) or [(), (), (), (), ()]
+    return {
+        'student': np.array(columns[0], dtype=np.int32),
+        'goal': np.array(columns[1], dtype=np.int16),
+        'benchmark': np.array(columns[2], dtype=np.int16),
+        'day': np.array(columns[3], dtype="datetime64[D]"),
+        'accuracy': np.array(columns[4], dtype=np.float32),
+        'student_ids': np.array(student_ids, dtype=str),
+        'meeting_dates': np.array(meeting_dates, dtype=str),
+    }
+
+
+def save_progress(progress, folder):
+    path = os.path.join(folder, PROGRESS_FILENAME)
+    with atomic_output(path) as temp_path:
+        with open(temp_path, "wb") as f:
+            np.savez_compressed(f, **progress)
+    return path
+
+
+def load_progress(folder):
+    with np.load(os.path.join(folder, PROGRESS_FILENAME)) as data:
+        return {name: data[name] for name in data.files}
+
+
+def benchmark_targets(folder, student_ids, goals, benchmarks):
+    # The "N%" in each benchmark's own wording, else DEFAULT_TARGET
+    targets = np.full(len(goals), DEFAULT_TARGET, dtype=np.float32)
+    with CaseloadStore(folder) as store:
+        records = {}
+        for i, (student_id, g_idx, s_idx) in enumerate(zip(student_ids, goals, benchmarks)):
+            if student_id not in records:
+                records[student_id] = store.current_record(student_id)
+            record = records[student_id]
+            try:
+                match = TARGET.search(record['goals'][g_idx - 1]['subgoals'][s_idx - 1])
+            except (TypeError, IndexError):
+                continue
+            if match:
+                targets[i] = float(match.group(1))
+    return targets
+
+
+def benchmark_trends(progress, targets=None, window=ROLLING_WINDOW):
+    # One row per (student, goal, benchmark) with observations, as arrays
+    student, goal, benchmark = progress['student'], progress['goal'], progress['benchmark']
+    day, accuracy = progress['day'], progress['accuracy'].astype(np.float64)
+    order = np.lexsort((day, benchmark, goal, student))
+    student, goal, benchmark, day, accuracy = (a[order] for a in (student, goal, benchmark, day, accuracy))
+
+    # Segment starts: wherever the (student, goal, benchmark) key changes
+    new_key = np.ones(len(order), dtype=bool)
+    new_key[1:] = (student[1:] != student[:-1]) | (goal[1:] != goal[:-1]) | (benchmark[1:] != benchmark[:-1])
+    starts = np.flatnonzero(new_key)
+    if not len(starts):
+        return None
+    ends = np.append(starts[1:], len(order))
+    counts = ends - starts
+    segment = np.repeat(np.arange(len(starts)), counts)
+
+    # Least-squares slope per segment, x in weeks from the segment's first session
+    weeks = (day - day[starts][segment]).astype(np.float64) / 7.0
+    sum_x = np.add.reduceat(weeks, starts)
+    sum_y = np.add.reduceat(accuracy, starts)
+    sum_xy = np.add.reduceat(weeks * accuracy, starts)
+    sum_xx = np.add.reduceat(weeks * weeks, starts)
+    denominator = counts * sum_xx - sum_x * sum_x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        trend = np.where(denominator > 0, (counts * sum_xy - sum_x * sum_y) / denominator, 0.0)
+
+    # Mean of each segment's last `window` sessions, from one running sum
+    running = np.concatenate(([0.0], np.cumsum(accuracy)))
+    last = np.minimum(counts, window)
+    rolling = (running[ends] - running[ends - last]) / last
+
+    last_day = day[ends - 1]
+    meeting_dates = np.array([d or "NaT" for d in progress['meeting_dates']], dtype="datetime64[D]")
+    meeting = meeting_dates[student[starts]]
+    horizon = last_day + np.timedelta64(RISK_HORIZON_WEEKS * 7, "D")
+    iep_end = np.where(np.isnat(meeting), horizon, meeting + np.timedelta64(365, "D"))
+    weeks_left = np.maximum((iep_end - last_day).astype(np.float64) / 7.0, 0.0)
+    projected = np.clip(rolling + trend * weeks_left, 0.0, 100.0)
+
+    if targets is None:
+        targets = np.full(len(starts), DEFAULT_TARGET)
+    at_risk = (counts >= MIN_SESSIONS) & (projected < targets)
+    return {
+        'student': student[starts],
+        'goal': goal[starts],
+        'benchmark': benchmark[starts],
+        'sessions': counts,
+        'first_day': day[starts],
+        'last_day': last_day,
+        'latest': accuracy[ends - 1],
+        'rolling': rolling,
+        'trend': trend,
+        'target': targets,
+        'projected': projected,
+        'at_risk': at_risk,
+    }
+
+
+def trend_keys(progress):
+    # The benchmark_trends rows' (student ID, goal, benchmark), for targets
+    keys = np.unique(np.stack([progress['student'], progress['goal'], progress['benchmark']], axis=1), axis=0)
+    return progress['student_ids'][keys[:, 0]], keys[:, 1], keys[:, 2]
+
+
+def write_progress_summary(folder, progress, trends):
+    from openpyxl import Workbook
+    names = {}
+    with CaseloadStore(folder) as store:
+        for student_id in progress['student_ids']:
+            record = store.current_record(str(student_id))
+            names[str(student_id)] = (record['first_name'], record['last_name']) if record else ("", "")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Progress")
+    ws.append([
+        'First Name', 'Last Name', 'Student ID', 'Goal', 'Benchmark', 'Sessions', 'First Session',
+        'Last Session', 'Latest %', f'Last {ROLLING_WINDOW} Avg %', 'Trend (pts/week)', 'Target %',
+        'Projected %', 'At Risk'
+    ])
+    for i in range(len(trends['student'])):
+        student_id = str(progress['student_ids'][trends['student'][i]])
+        ws.append([
+            *names[student_id], student_id, int(trends['goal'][i]), int(trends['benchmark'][i]),
+            int(trends['sessions'][i]), str(trends['first_day'][i]), str(trends['last_day'][i]),
+            round(float(trends['latest'][i]), 1), round(float(trends['rolling'][i]), 1),
+            round(float(trends['trend'][i]), 2), round(float(trends['target'][i]), 1),
+            round(float(trends['projected'][i]), 1), "Yes" if trends['at_risk'][i] else "",
+        ])
+    path = os.path.join(folder, SUMMARY_FILENAME)
+    with atomic_output(path) as temp_path:
+        wb.save(temp_path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collect progress data from completed notes.")
+    parser.add_argument("folder", help="caseload folder Day One has been run on")
+    args = parser.parse_args(argv)
+
+    progress = ingest_progress(args.folder)
+    save_progress(progress, args.folder)
+    if not len(progress['accuracy']):
+        print("No filled-in notes found.", file=sys.stderr)
+        return 0
+
+    targets = benchmark_targets(args.folder, *trend_keys(progress))
+    trends = benchmark_trends(progress, targets)
+    path = write_progress_summary(args.folder, progress, trends)
+    print(
+        f"{len(progress['accuracy'])} observations, {len(trends['student'])} benchmarks, "
+        f"{int(trends['at_risk'].sum())} at risk; see {path}",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,7 @@ import re
 import shutil
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from PyPDF2 import PdfReader
+from extraction_cache import ExtractionCache, cached_extract
 from docx import Document
 
 def extract_name(text):
@@ -111,35 +111,46 @@ def create_note_doc(first_name, goals_data, folder_path):
     filename = os.path.join(folder_path, f"note.docx")
     doc.save(filename)
 
+# Bump when the parsing below changes so cached results get re-parsed
+PARSER_VERSION = "multi-goal-1"
+
+def parse_iep_text(full_text):
+    name = extract_name(full_text)
+    return {
+        "name": name,
+        "id": extract_id(full_text),
+        "goals": extract_communication_goals(full_text, name),
+    }
+
 def process_pdfs(folder):
-    for file_name in os.listdir(folder):
-        if not file_name.lower().endswith(".pdf"):
-            continue
+    with ExtractionCache(folder) as cache:
+        for file_name in os.listdir(folder):
+            if not file_name.lower().endswith(".pdf"):
+                continue
 
-        pdf_path = os.path.join(folder, file_name)
-        reader = PdfReader(pdf_path)
-        full_text = "\n".join(page.extract_text() or "" for page in reader.pages)
+            pdf_path = os.path.join(folder, file_name)
+            parsed = cached_extract(cache, pdf_path, PARSER_VERSION, parse_iep_text)
 
-        name = extract_name(full_text)
-        student_id = extract_id(full_text)
-        goals_data = extract_communication_goals(full_text, name)
+            name = parsed["name"]
+            student_id = parsed["id"]
+            goals_data = parsed["goals"]
 
-        if not name and goals_data:
-            name_guess = re.search(r"([A-Z][a-z]+) will", goals_data[0]['goal'])
-            name = f"Unknown {name_guess.group(1)}" if name_guess else "Unknown"
+            if not name and goals_data:
+                name_guess = re.search(r"([A-Z][a-z]+) will", goals_data[0]['goal'])
+                name = f"Unknown {name_guess.group(1)}" if name_guess else "Unknown"
 
-        safe_name = re.sub(r'[\\/*?:"<>|\n]', '', name.replace(",", "").replace(" ", "_"))
-        folder_name = f"{safe_name}_{student_id or 'NoID'}"
-        student_folder = os.path.join(folder, folder_name)
-        os.makedirs(student_folder, exist_ok=True)
+            safe_name = re.sub(r'[\\/*?:"<>|\n]', '', name.replace(",", "").replace(" ", "_"))
+            folder_name = f"{safe_name}_{student_id or 'NoID'}"
+            student_folder = os.path.join(folder, folder_name)
+            os.makedirs(student_folder, exist_ok=True)
 
-        first_name = extract_first_name(name)
+            first_name = extract_first_name(name)
 
-        # ✅ New correct calls
-        create_goal_doc(goals_data, student_folder)
-        create_note_doc(first_name, goals_data, student_folder)
+            # ✅ New correct calls
+            create_goal_doc(goals_data, student_folder)
+            create_note_doc(first_name, goals_data, student_folder)
 
-        shutil.move(pdf_path, os.path.join(student_folder, file_name))
+            shutil.move(pdf_path, os.path.join(student_folder, file_name))
 
 def select_folder():
     folder = filedialog.askdirectory()
@@ -153,17 +164,18 @@ def run_extraction():
     else:
         messagebox.showerror("Error", "Please select a folder first.")
 
-# GUI
-root = tk.Tk()
-root.title("IEP Goal Extractor")
-root.geometry("600x400")
+if __name__ == "__main__":
+    # GUI
+    root = tk.Tk()
+    root.title("IEP Goal Extractor")
+    root.geometry("600x400")
 
-folder_path_var = tk.StringVar()
+    folder_path_var = tk.StringVar()
 
-tk.Label(root, text="Step 1: Select Folder with IEP PDFs").pack(pady=5)
-tk.Button(root, text="Select Folder", command=select_folder).pack(pady=5)
-tk.Label(root, textvariable=folder_path_var).pack(pady=5)
-tk.Label(root, text="Step 2: Run Extraction").pack(pady=5)
-tk.Button(root, text="Run Extraction", command=run_extraction).pack(pady=5)
+    tk.Label(root, text="Step 1: Select Folder with IEP PDFs").pack(pady=5)
+    tk.Button(root, text="Select Folder", command=select_folder).pack(pady=5)
+    tk.Label(root, textvariable=folder_path_var).pack(pady=5)
+    tk.Label(root, text="Step 2: Run Extraction").pack(pady=5)
+    tk.Button(root, text="Run Extraction", command=run_extraction).pack(pady=5)
 
-root.mainloop()
+    root.mainloop()
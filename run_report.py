@@ -0,0 +1,185 @@
+import json
+import time
+import statistics
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# ------------------------
+# RUN REPORT
+# ------------------------
+# Wall time, CPU time and peak memory for every stage of a Day One run, per
+# file and in total. Timing is cheap and always on. Peak memory comes from
+# tracemalloc, which counts Python allocations only (not lxml's C buffers)
+# and roughly triples the run time, so it's only kept with track_memory=True.
+#
+# Stages: pdf_text (PDF text backend), parse (the single-pass goal parser),
+# excel (the streaming goals_workbook writer), store (caseload store), index
+# (goal search index), docx (building and saving both documents), move
+# (shutil.move). The GUI also passes in how long it took to open and to
+# finish importing its libraries (app_startup).
+# PDFs left out as copies or older IEPs of another PDF are listed under
+# skipped (iep_duplicates), and ones whose text looked malformed under
+# flagged (parse_guard).
+
+REPORT_FILENAME = "iep_run_report.json"
+SLOWEST_COUNT = 10
+# A file is flagged as slow when it takes this many times the median file
+SLOW_FACTOR = 3
+
+
+@contextmanager
+def measure(timings, stage, track_memory=False):
+    # Adds one measurement to timings[stage]; works in worker processes too,
+    # since timings is a plain dict that can be sent back to the parent
+    if track_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield
+    finally:
+        entry = timings.setdefault(stage, {'wall': 0.0, 'cpu': 0.0, 'peak_kb': 0})
+        entry['wall'] += time.perf_counter() - wall
+        entry['cpu'] += time.process_time() - cpu
+        if track_memory:
+            peak = (tracemalloc.get_traced_memory()[1] - baseline) // 1024
+            entry['peak_kb'] = max(entry['peak_kb'], peak)
+
+
+def stage_timer(run_report, stage, filename=None):
+    # Lets the pipeline wrap a stage whether or not a report is being kept
+    return run_report.stage(stage, filename) if run_report else nullcontext()
+
+
+class RunReport:
+    def __init__(self, track_memory=False, startup=None):
+        self.track_memory = track_memory
+        self.startup = startup
+        self.started = time.time()
+        self.wall_started = time.perf_counter()
+        self.stages = {}
+        self.files = {}
+        self.cached = set()
+        self.skipped = []
+        self.flagged = []
+        self.missing = []
+        self.started_tracing = track_memory and not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+
+    def close(self):
+        # Tracing slows every allocation, so don't leave it on after the run
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    @contextmanager
+    def stage(self, stage, filename=None):
+        timings = {}
+        with measure(timings, stage, self.track_memory):
+            yield
+        self.add(filename, timings)
+
+    def add(self, filename, timings):
+        # filename is None for stages that cover the whole caseload (the workbook)
+        for stage, entry in timings.items():
+            total = self.stages.setdefault(stage, {'wall': 0.0, 'cpu': 0.0, 'peak_kb': 0, 'count': 0})
+            total['wall'] += entry['wall']
+            total['cpu'] += entry['cpu']
+            total['peak_kb'] = max(total['peak_kb'], entry['peak_kb'])
+            total['count'] += 1
+            if filename is not None:
+                file_stages = self.files.setdefault(filename, {})
+                file_stages[stage] = dict(entry)
+
+    def mark_cached(self, filename):
+        self.cached.add(filename)
+        self.files.setdefault(filename, {})
+
+    def skip(self, filename, reason, kept):
+        self.skipped.append({'filename': filename, 'reason': reason, 'kept': kept})
+
+    def flag(self, filename, warnings):
+        self.flagged.append({'filename': filename, 'warnings': list(warnings)})
+
+    def missing_pdf(self, filename):
+        self.missing.append(filename)
+
+    def file_rows(self):
+        rows = []
+        for filename, stages in self.files.items():
+            rows.append({
+                'filename': filename,
+                'cached': filename in self.cached,
+                'wall': sum(s['wall'] for s in stages.values()),
+                'cpu': sum(s['cpu'] for s in stages.values()),
+                'peak_kb': max((s['peak_kb'] for s in stages.values()), default=0),
+                'stages': stages,
+            })
+        return rows
+
+    def summary(self):
+        rows = self.file_rows()
+        measured = [row['wall'] for row in rows if not row['cached']]
+        threshold = SLOW_FACTOR * statistics.median(measured) if measured else None
+        for row in rows:
+            row['slow'] = threshold is not None and not row['cached'] and row['wall'] > threshold
+
+        slowest = sorted(rows, key=lambda row: row['wall'], reverse=True)[:SLOWEST_COUNT]
+        return {
+            'started': time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            'wall_seconds': time.perf_counter() - self.wall_started,
+            'track_memory': self.track_memory,
+            'startup': self.startup,
+            'file_count': len(rows),
+            'cached_count': len(self.cached),
+            'stages': self.stages,
+            'slowest': [row['filename'] for row in slowest],
+            'slow_files': [row['filename'] for row in rows if row['slow']],
+            'skipped': self.skipped,
+            'flagged': self.flagged,
+            'missing': self.missing,
+            'files': rows,
+        }
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+    def summary_text(self, slowest=3):
+        # Short version for a message box
+        summary = self.summary()
+        lines = [f"{summary['file_count']} files in {summary['wall_seconds']:.1f}s "
+                 f"({summary['cached_count']} from cache)"]
+        if self.skipped:
+            identical = sum(1 for entry in self.skipped if entry['reason'] == "identical")
+            lines.append(f"Skipped {len(self.skipped)} PDFs: {identical} identical copies, "
+                         f"{len(self.skipped) - identical} superseded by a newer IEP")
+        if self.flagged:
+            lines.append(f"Flagged {len(self.flagged)} PDFs with unusual text; check their goals by hand:")
+            for entry in self.flagged[:slowest]:
+                lines.append(f"  {entry['filename']}: {'; '.join(entry['warnings'])}")
+        if self.missing:
+            lines.append(f"{len(self.missing)} PDFs were gone from the folder when filing resumed; "
+                         f"their documents were written but there was nothing to file: {', '.join(self.missing[:slowest])}")
+        for stage, total in summary['stages'].items():
+            line = f"{stage}: {total['wall']:.2f}s wall, {total['cpu']:.2f}s CPU"
+            if self.track_memory:
+                line += f", peak {total['peak_kb'] / 1024:.1f} MB"
+            lines.append(line)
+        if self.startup and self.startup.get('window_seconds') is not None:
+            line = f"Startup: window in {self.startup['window_seconds']:.2f}s"
+            if self.startup.get('warmup_seconds') is not None:
+                line += f", libraries loaded {self.startup['warmup_seconds']:.2f}s later"
+            lines.append(line)
+        rows = {row['filename']: row for row in summary['files']}
+        if summary['slowest']:
+            lines.append("Slowest:")
+            for filename in summary['slowest'][:slowest]:
+                flag = "  (slow)" if rows[filename]['slow'] else ""
+                lines.append(f"  {filename}: {rows[filename]['wall']:.2f}s{flag}")
+        return "\n".join(lines)
@@ -0,0 +1,194 @@
+import os
+import csv
+import sys
+import time
+import argparse
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from day_one import note_paragraphs, note_preamble, student_folder_name
+from docx_templates import NOTE_TEMPLATE_FILENAME, DocxTemplate, find_template
+from caseload_store import CaseloadStore
+
+# ------------------------
+# WEEKLY SESSION NOTES
+# ------------------------
+# Day One writes one note.docx per student. This writes the note for every
+# scheduled session in a week or a month at once, from a schedule CSV:
+#
+#   student_id,date            one row per session (2025-09-08 or 09/08/2025)
+#   student_id,weekday         a standing session (Mon, Tuesday, ...) on every
+#                              such day between --start and --end
+#
+# Goals come from the caseload store (the student's current IEP), so Day One
+# has to have run on the folder first. Each student's part of the note
+# (their benchmarks run through clean_action) is worked out once and reused
+# for every session; only the date changes between notes. Rendering runs on
+# a thread pool, since it's zlib and file writes, which release the GIL.
+#
+#   one per session   <student folder>/note_2025-09-08.docx
+#   --combined        session_notes/notes_2025-09-08.docx, every student seen
+#                     that day in one document
+#
+#   python session_notes.py FOLDER schedule.csv --start 2025-09-08 --end 2025-09-12
+
+SESSION_NOTES_DIRNAME = "session_notes"
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y"]
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+def parse_date(text):
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text.strip(), date_format).date()
+        except ValueError:
+            pass
+    raise ValueError(f"not a date: {text!r} (use YYYY-MM-DD or MM/DD/YYYY)")
+
+
+def parse_weekday(text):
+    day = text.strip().lower()[:3]
+    if day not in WEEKDAYS:
+        raise ValueError(f"not a weekday: {text!r}")
+    return WEEKDAYS.index(day)
+
+
+def load_schedule(path, start, end):
+    # Sorted, de-duplicated [(date, student_id)] for start..end inclusive
+    days = [start + datetime.timedelta(days=n) for n in range((end - start).days + 1)]
+    sessions = set()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for line, row in enumerate(csv.DictReader(f), 2):
+            student_id = (row.get('student_id') or "").strip()
+            if not student_id:
+                raise ValueError(f"{path}, line {line}: no student_id")
+            try:
+                if (row.get('date') or "").strip():
+                    date = parse_date(row['date'])
+                    if start <= date <= end:
+                        sessions.add((date, student_id))
+                elif (row.get('weekday') or "").strip():
+                    weekday = parse_weekday(row['weekday'])
+                    sessions.update((day, student_id) for day in days if day.weekday() == weekday)
+                else:
+                    raise ValueError("needs a date or a weekday")
+            except ValueError as e:
+                raise ValueError(f"{path}, line {line}: {e}") from None
+    return sorted(sessions)
+
+
+def load_note_templates(folder):
+    # A session note is note.docx with its date under the heading, so the
+    # heading is the only boilerplate; the day document has none
+    path = find_template(folder, NOTE_TEMPLATE_FILENAME)
+    note = DocxTemplate(path)
+    note.add_boilerplate([note.heading("Note", level=1)])
+    return {'note': note, 'day': DocxTemplate(path)}
+
+
+def prepare_students(folder, student_ids, note):
+    # {student_id: everything a note needs}, once per student; IDs the store
+    # doesn't know are returned separately
+    prepared, unknown = {}, []
+    with CaseloadStore(folder) as store:
+        name_lookup = store.names()
+        for student_id in student_ids:
+            record = store.current_record(student_id)
+            if record is None:
+                unknown.append(student_id)
+                continue
+            first_name, folder_name = student_folder_name(record, name_lookup)
+            prepared[student_id] = {
+                # Names repeat across a caseload; progress_data reads the ID back
+                'name': f"{record['first_name']} {record['last_name']} ({student_id})",
+                'sort_key': (record['last_name'].lower(), record['first_name'].lower(), student_id),
+                'folder': os.path.join(folder, folder_name),
+                'paragraphs': note_preamble(note) + note_paragraphs(note, first_name, record['goals']),
+            }
+    return prepared, unknown
+
+
+def session_date(note, date):
+    return note.paragraph(f"Date: {date:%m/%d/%Y}")
+
+
+def render_student_note(templates, student, date):
+    note = templates['note']
+    os.makedirs(student['folder'], exist_ok=True)
+    path = os.path.join(student['folder'], f"note_{date.isoformat()}.docx")
+    note.save([session_date(note, date)] + student['paragraphs'], path)
+    return path
+
+
+def render_day_notes(templates, students, date, out_dir):
+    day = templates['day']
+    paragraphs = [day.heading(f"Session notes {date:%m/%d/%Y}", level=1)]
+    for student in sorted(students, key=lambda s: s['sort_key']):
+        paragraphs.append(day.heading(student['name'], level=2))
+        paragraphs.extend(student['paragraphs'])
+    path = os.path.join(out_dir, f"notes_{date.isoformat()}.docx")
+    day.save(paragraphs, path)
+    return path
+
+
+def generate_session_notes(folder, sessions, combined=False, workers=None):
+    # sessions is [(date, student_id)]; returns (paths written, sessions
+    # rendered, unknown IDs)
+    templates = load_note_templates(folder)
+    prepared, unknown = prepare_students(folder, sorted({sid for _, sid in sessions}), templates['note'])
+    sessions = [(date, sid) for date, sid in sessions if sid in prepared]
+
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        if combined:
+            out_dir = os.path.join(folder, SESSION_NOTES_DIRNAME)
+            os.makedirs(out_dir, exist_ok=True)
+            by_date = {}
+            for date, sid in sessions:
+                by_date.setdefault(date, []).append(prepared[sid])
+            paths = list(pool.map(
+                lambda item: render_day_notes(templates, item[1], item[0], out_dir), sorted(by_date.items())
+            ))
+        else:
+            paths = list(pool.map(
+                lambda session: render_student_note(templates, prepared[session[1]], session[0]), sessions
+            ))
+    return paths, len(sessions), unknown
+
+
+def week_start(today):
+    return today - datetime.timedelta(days=today.weekday())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write session notes for every scheduled session.")
+    parser.add_argument("folder", help="caseload folder Day One has been run on")
+    parser.add_argument("schedule", help="CSV with student_id and a date or weekday column")
+    parser.add_argument("--start", type=parse_date, help="first day (default: this Monday)")
+    parser.add_argument("--end", type=parse_date, help="last day (default: six days after --start)")
+    parser.add_argument("--combined", action="store_true", help="one document per day instead of one per session")
+    parser.add_argument("-w", "--workers", type=int, help="rendering threads (default: one per core)")
+    args = parser.parse_args(argv)
+
+    start = args.start or week_start(datetime.date.today())
+    end = args.end or start + datetime.timedelta(days=6)
+    if end < start:
+        parser.error("--end is before --start")
+    try:
+        sessions = load_schedule(args.schedule, start, end)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    started = time.perf_counter()
+    paths, rendered, unknown = generate_session_notes(args.folder, sessions, args.combined, args.workers)
+    for student_id in unknown:
+        print(f"Skipped student {student_id}: not in this caseload's store", file=sys.stderr)
+    print(
+        f"Wrote {len(paths)} document(s) for {rendered} session(s), {start} to {end}, "
+        f"in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr
+    )
+    return 1 if unknown else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import os
+import re
+import sys
+import random
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from day_one import extract_communication_goals
+from synthetic_iep import iep_pages
+
+# ------------------------
+# GOAL PARSER REGRESSION
+# ------------------------
+# The single-pass goal parser has to give exactly what the regex parser it
+# replaced gave, edge cases included. old_communication_goals below is that
+# parser, frozen as it was; don't change it to match the new one. Both are
+# run on synthetic IEPs and on text spliced from the fragments the parsers
+# treat specially (headers, page footers, "Goal:" markers, benchmark blocks,
+# "Label:" lines), which is where the two were most likely to drift apart.
+
+OLD_SUBGOAL_EXCLUDE = r"(student be|participate|assessment|instruction|comment)"
+
+
+def old_subgoals(block):
+    subgoals = []
+    for line in block.strip().splitlines():
+        line = line.strip()
+        if (
+            len(line.split()) > 5 and
+            " will " in line.lower() and
+            not re.search(OLD_SUBGOAL_EXCLUDE, line, re.IGNORECASE)
+        ):
+            subgoals.append(line)
+    return subgoals
+
+
+def old_communication_goals(text):
+    comm_blocks = re.findall(
+        r"Domain\(s\)/TSAA\(s\):\s*Communication(.*?)(?=\nDomain\(s\)|\nAssessments|\nAccommodations|Page \d|\Z)",
+        text, re.DOTALL | re.IGNORECASE
+    )
+    results = []
+
+    for section in comm_blocks:
+        goal_blocks = re.split(r"\bGoal:\s*", section, flags=re.IGNORECASE)
+        for block in goal_blocks[1:]:
+            goal_text = re.split(
+                r"(?:\nShort-term Objectives|Assessment Procedures|Progress Reported|\n[A-Z][a-z]+:|\Z)",
+                block, maxsplit=1, flags=re.IGNORECASE
+            )[0].strip().replace('\n', ' ')
+
+            benchmark_blocks = re.findall(
+                r"Short-term Objectives or Benchmarks:(.*?)(?=\n(?:Short-term Objectives or Benchmarks:|Goal:|Domain\(s\)|Assessments|Accommodations|Page \d|\Z))",
+                block, re.DOTALL | re.IGNORECASE
+            )
+
+            subgoals = []
+            for bblock in benchmark_blocks:
+                subgoals.extend(old_subgoals(bblock))
+            if not subgoals:
+                subgoals = old_subgoals(block)
+
+            if goal_text:
+                results.append({
+                    "goal": goal_text,
+                    "subgoals": subgoals
+                })
+
+    return results
+
+
+FRAGMENTS = [
+    "Domain(s)/TSAA(s): Communication",
+    "Domain(s)/TSAA(s): communication skills",
+    "Domain(s)/TSAA(s): Reading",
+    "Goal: ",
+    "goal:",
+    "Short-term Objectives or Benchmarks:",
+    "Short-term Objectives",
+    "Assessment Procedures: clinician data",
+    "Progress Reported: quarterly",
+    "Assessments",
+    "Accommodations",
+    "Page 3 of 9",
+    "Note: reviewed with the team",
+    "",
+    "  ",
+    "Sam will produce /r/ in all positions with 80% accuracy",
+    "Sam will participate in the lesson with peers daily",
+    "Sam will  read",
+    "Comment: the student will do several more things",
+    "By June, Sam will answer wh- questions about a passage.",
+    "The team discussed progress this period.",
+]
+
+
+def synthetic_text(rng, index):
+    pages = iep_pages(rng, index, rng.randint(6, 12))
+    return "\n".join("\n".join(lines) for lines in pages)
+
+
+def spliced_text(rng):
+    # Fragments on their own lines or run together, in any order
+    lines = []
+    for _ in range(rng.randint(1, 40)):
+        fragment = rng.choice(FRAGMENTS)
+        if lines and rng.random() < 0.3:
+            lines[-1] += " " + fragment
+        else:
+            lines.append(fragment)
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_old_parser_on_synthetic_ieps(seed):
+    rng = random.Random(seed)
+    for index in range(40):
+        text = synthetic_text(rng, index)
+        assert extract_communication_goals(text) == old_communication_goals(text), text
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_old_parser_on_spliced_text(seed):
+    rng = random.Random(seed)
+    for _ in range(1000):
+        text = spliced_text(rng)
+        assert extract_communication_goals(text) == old_communication_goals(text), text
+
+
+def test_synthetic_ieps_have_goals():
+    # Guards the comparison above against both parsers finding nothing
+    text = synthetic_text(random.Random(0), 0)
+    goals = extract_communication_goals(text)
+    assert goals
+    assert all(goal['subgoals'] for goal in goals)